@@ -0,0 +1,173 @@
+"""
+Fill the users table with synthetic users up to a target row count.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.generate_users --rows 20000000
+
+Rows are generated deterministically from --seed and streamed in with COPY,
+so tens of millions of rows load in minutes. Re-running with a larger
+--rows only adds the difference. Distributions are meant to resemble a
+production table: a few large email domains and a long tail, some mixed
+case emails, mostly active users, and sign-ups skewed towards recent dates.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+
+from commands.import_users import asyncpg_dsn
+from core.config import settings
+from core.security import get_password_hash
+
+COLUMNS = (
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "hashed_password",
+    "is_active",
+    "is_superuser",
+    "is_verified",
+    "created_at",
+    "updated_at",
+)
+
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael",
+    "Linda", "David", "Elizabeth", "Maria", "Wei", "Yuki", "Ahmed", "Olga",
+    "Carlos", "Priya", "Lucas", "Emma", "Noah", "Fatima", "Ivan", "Sofia",
+)  # fmt: skip
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+    "Davis", "Rodriguez", "Martinez", "Wang", "Li", "Kim", "Nguyen", "Ivanov",
+    "Muller", "Rossi", "Silva", "Sato", "Khan", "Cohen", "Novak", "Dubois",
+)  # fmt: skip
+# Weighted like a consumer service: a handful of providers hold most users
+EMAIL_DOMAINS = (
+    ("gmail.com", 40),
+    ("yahoo.com", 10),
+    ("outlook.com", 9),
+    ("hotmail.com", 7),
+    ("icloud.com", 6),
+    ("proton.me", 2),
+)
+LONG_TAIL_DOMAINS = 5000
+LONG_TAIL_WEIGHT = 26
+
+
+class UserGenerator:
+    """Deterministic stream of realistic user rows."""
+
+    def __init__(
+        self,
+        seed: int,
+        hashed_password: str,
+        inactive_rate: float,
+        verified_rate: float,
+        mixed_case_rate: float,
+        history_days: int,
+    ):
+        self.random = random.Random(seed)
+        self.hashed_password = hashed_password
+        self.inactive_rate = inactive_rate
+        self.verified_rate = verified_rate
+        self.mixed_case_rate = mixed_case_rate
+        self.history_days = history_days
+        self.now = datetime.now(UTC)
+        self._domains = [domain for domain, _ in EMAIL_DOMAINS] + [None]
+        self._weights = [weight for _, weight in EMAIL_DOMAINS] + [LONG_TAIL_WEIGHT]
+
+    def _domain(self) -> str:
+        domain = self.random.choices(self._domains, self._weights)[0]
+        if domain is None:
+            # Zipf-like long tail of company and school domains
+            rank = int(self.random.paretovariate(1.2)) % LONG_TAIL_DOMAINS
+            domain = f"org{rank}.example.com"
+        return domain
+
+    def _created_at(self) -> datetime:
+        # Beta(2, 1) puts more sign-ups near now, as in a growing service
+        age = 1 - self.random.betavariate(2, 1)
+        return self.now - timedelta(days=age * self.history_days)
+
+    def row(self, number: int) -> tuple:
+        first_name = self.random.choice(FIRST_NAMES)
+        last_name = self.random.choice(LAST_NAMES)
+        local_part = f"{first_name}.{last_name}.{number}"
+        if self.random.random() >= self.mixed_case_rate:
+            local_part = local_part.lower()
+        created_at = self._created_at()
+        updated_at = created_at + (self.now - created_at) * self.random.random()
+        return (
+            first_name,
+            last_name,
+            f"{first_name.lower()}_{last_name.lower()}_{number}",
+            f"{local_part}@{self._domain()}",
+            self.hashed_password,
+            self.random.random() >= self.inactive_rate,
+            self.random.random() < 0.0001,
+            self.random.random() < self.verified_rate,
+            created_at,
+            updated_at,
+        )
+
+    def rows(self, start: int, count: int) -> Iterator[tuple]:
+        for number in range(start, start + count):
+            yield self.row(number)
+
+
+async def main(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(asyncpg_dsn(settings.database_url))
+    try:
+        existing = await conn.fetchval("SELECT count(*) FROM users")
+        missing = args.rows - existing
+        if missing <= 0:
+            print(f"users already has {existing} rows")
+            return
+
+        # Numbering past the largest id keeps usernames and emails unique
+        start = (await conn.fetchval("SELECT coalesce(max(id), 0) FROM users")) + 1
+        generator = UserGenerator(
+            seed=args.seed + start,
+            hashed_password=get_password_hash("synthetic-password"),
+            inactive_rate=args.inactive_rate,
+            verified_rate=args.verified_rate,
+            mixed_case_rate=args.mixed_case_rate,
+            history_days=args.history_days,
+        )
+
+        began = time.perf_counter()
+        loaded = 0
+        while loaded < missing:
+            chunk = min(args.chunk_size, missing - loaded)
+            await conn.copy_records_to_table(
+                "users",
+                records=generator.rows(start + loaded, chunk),
+                columns=COLUMNS,
+            )
+            loaded += chunk
+            rate = loaded / (time.perf_counter() - began)
+            print(f"{loaded}/{missing} rows ({rate:.0f} rows/s)")
+
+        # Fresh statistics, so plans reflect the new table size
+        await conn.execute("ANALYZE users")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, required=True, help="Target row count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--inactive-rate", type=float, default=0.03)
+    parser.add_argument("--verified-rate", type=float, default=0.7)
+    parser.add_argument("--mixed-case-rate", type=float, default=0.05)
+    parser.add_argument("--history-days", type=int, default=5 * 365)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,308 @@
+"""
+Load benchmark for the login, refresh, current user and ValidateToken paths.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.load --users 1000 \\
+        --concurrency 1,16,64 --duration 15 --output load.json
+
+Starts the service in a subprocess against DATABASE_URL (migrated to head),
+seeds benchmark users, then drives each scenario at each concurrency level
+for a fixed duration and reports throughput and latency percentiles. Pass
+--url to benchmark an already running service instead.
+
+Postgres is required: the service relies on Postgres-only SQL (COPY,
+ON CONFLICT, RETURNING, SKIP LOCKED), so there is no SQLite stand-in.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import asyncpg
+import grpc
+import httpx
+from contracts.gen import auth_pb2, auth_pb2_grpc
+from google.protobuf.message_factory import GetMessageClass
+
+from benchmarks.report import summarize_latencies, write_report
+from commands.import_users import asyncpg_dsn
+from core.config import settings
+from core.hashing import password_hasher
+from core.security import get_password_hash
+from services.user_import_service import user_import_service
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = REPO_ROOT / "src"
+PASSWORD = "benchmark-password"
+SCENARIOS = ("login", "refresh", "users_me", "grpc_validate_token")
+
+# Limits that would otherwise throttle a single benchmarking client
+SERVER_ENV = {
+    "RATE_LIMIT_IP_REQUESTS": "1000000000",
+    "RATE_LIMIT_EMAIL_REQUESTS": "1000000000",
+    "LOG_LEVEL": "WARNING",
+}
+
+Call = Callable[[], Awaitable[None]]
+
+# The request message of ValidateToken, whatever the contracts name it
+ValidateTokenRequest = GetMessageClass(
+    auth_pb2.DESCRIPTOR.services_by_name["AuthService"]
+    .methods_by_name["ValidateToken"]
+    .input_type
+)
+
+
+def user_email(index: int) -> str:
+    return f"bench-{index}@example.com"
+
+
+async def seed_users(count: int) -> None:
+    """Insert benchmark users that don't exist yet, sharing one bcrypt hash."""
+    hashed_password = get_password_hash(PASSWORD)
+    rows = (
+        (
+            index + 1,
+            {
+                "first_name": "Bench",
+                "last_name": f"User{index}",
+                "username": f"bench_{index}",
+                "email": user_email(index),
+                "hashed_password": hashed_password,
+            },
+        )
+        for index in range(count)
+    )
+    conn = await asyncpg.connect(asyncpg_dsn(settings.database_url))
+    try:
+        await user_import_service.import_users(conn, rows)
+    finally:
+        await conn.close()
+
+
+def start_server(port: int) -> subprocess.Popen:
+    # Run from the repository root like `just run`, so the service reads
+    # the same .env as the rest of the tooling
+    pythonpath = os.pathsep.join(
+        path for path in (str(SRC_DIR), os.environ.get("PYTHONPATH")) if path
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=REPO_ROOT,
+        env={**os.environ, **SERVER_ENV, "PYTHONPATH": pythonpath},
+    )
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError("Service did not become healthy")
+        await asyncio.sleep(0.2)
+
+
+async def login(client: httpx.AsyncClient, index: int) -> dict:
+    """Log in a benchmark user, waiting out load shedding."""
+    while True:
+        response = await client.post(
+            "/login", json={"email": user_email(index), "password": PASSWORD}
+        )
+        if response.status_code != 503:
+            response.raise_for_status()
+            return response.json()
+        await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+
+class Scenarios:
+    """Factories building the per-worker request function of each scenario."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        stub: auth_pb2_grpc.AuthServiceStub,
+        users: int,
+    ):
+        self.client = client
+        self.stub = stub
+        self.users = users
+
+    def _pick_user(self, worker: int) -> int:
+        return (worker * 7919 + random.randrange(self.users)) % self.users
+
+    async def login(self, worker: int) -> Call:
+        async def call() -> None:
+            email = user_email(self._pick_user(worker))
+            response = await self.client.post(
+                "/login", json={"email": email, "password": PASSWORD}
+            )
+            response.raise_for_status()
+
+        return call
+
+    async def refresh(self, worker: int) -> Call:
+        # Refresh tokens rotate, so each worker follows its own chain
+        user = self._pick_user(worker)
+        tokens = await login(self.client, user)
+
+        async def call() -> None:
+            try:
+                response = await self.client.post(
+                    "/refresh", json={"refresh_token": tokens["refresh_token"]}
+                )
+                response.raise_for_status()
+            except httpx.HTTPError:
+                # The token may be consumed or its family revoked; a fresh
+                # chain keeps one failure from turning every later call
+                # into reuse. The failure still counts as an error.
+                tokens.update(await login(self.client, user))
+                raise
+            tokens.update(response.json())
+
+        return call
+
+    async def users_me(self, worker: int) -> Call:
+        tokens = await login(self.client, self._pick_user(worker))
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        async def call() -> None:
+            response = await self.client.get("/users/me", headers=headers)
+            response.raise_for_status()
+
+        return call
+
+    async def grpc_validate_token(self, worker: int) -> Call:
+        tokens = await login(self.client, self._pick_user(worker))
+        request = ValidateTokenRequest(token=tokens["access_token"])
+
+        async def call() -> None:
+            await self.stub.ValidateToken(request)
+
+        return call
+
+
+async def drive(
+    name: str,
+    make_call: Callable[[int], Awaitable[Call]],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> dict:
+    """Run concurrency workers back to back and record latencies after warmup."""
+    calls = [await make_call(worker) for worker in range(concurrency)]
+    latencies: list[float] = []
+    errors = 0
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    async def worker(call: Call) -> None:
+        nonlocal errors
+        while (began := time.perf_counter()) < deadline:
+            try:
+                await call()
+            except (httpx.HTTPError, grpc.aio.AioRpcError):
+                if began >= measure_from:
+                    errors += 1
+                continue
+            if began >= measure_from:
+                latencies.append(time.perf_counter() - began)
+
+    await asyncio.gather(*(worker(call) for call in calls))
+    return {
+        "name": name,
+        "concurrency": concurrency,
+        "duration_seconds": duration,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / duration,
+        "latency": summarize_latencies(latencies),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    if not args.skip_seed:
+        password_hasher.start()
+        try:
+            await seed_users(args.users)
+        finally:
+            password_hasher.shutdown()
+
+    server = None if args.url else start_server(args.port)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=max(args.concurrency) * 2)
+    try:
+        async with (
+            httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client,
+            grpc.aio.insecure_channel(args.grpc_target) as channel,
+        ):
+            await wait_until_healthy(client, timeout=60)
+            scenarios = Scenarios(
+                client, auth_pb2_grpc.AuthServiceStub(channel), args.users
+            )
+
+            results = []
+            for name in args.scenarios:
+                for concurrency in args.concurrency:
+                    results.append(
+                        await drive(
+                            name,
+                            getattr(scenarios, name),
+                            concurrency,
+                            args.duration,
+                            args.warmup,
+                        )
+                    )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    write_report("load", results, args.output)
+
+
+def int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",")]
+
+
+def scenario_list(value: str) -> list[str]:
+    names = value.split(",")
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown scenarios: {', '.join(unknown)}")
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--scenarios", type=scenario_list, default=list(SCENARIOS))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Benchmark a running service at this URL")
+    parser.add_argument("--grpc-target", default="127.0.0.1:50051")
+    parser.add_argument("--output", type=Path, help="Write JSON here, not stdout")
+
+    asyncio.run(main(parser.parse_args()))
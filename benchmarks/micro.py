@@ -0,0 +1,112 @@
+"""
+Microbenchmarks for token signing, token decoding and password verification.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.micro --output micro.json
+
+Each benchmark runs a number of rounds of back-to-back calls; percentiles
+are of the mean per-call time of each round, so they are stable enough to
+compare across commits on the same machine.
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmarks.report import summarize_latencies, write_report
+from core.cache import TTLCache
+from core.config import settings
+from core.key_ring import build_key_ring
+from core.security import get_password_hash, verify_password
+from services.token_service import TokenService
+
+PAYLOAD = {"sub": "42", "email": "bench@example.com"}
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    rounds: int,
+    number: int,
+) -> dict:
+    """Time rounds of number calls to func after one warmup round."""
+    for _ in range(number):
+        func()
+
+    per_call: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+
+    total_seconds = sum(per_call) * number
+    return {
+        "name": name,
+        "rounds": rounds,
+        "calls_per_round": number,
+        "ops_per_second": rounds * number / total_seconds,
+        "latency": summarize_latencies(per_call),
+    }
+
+
+def make_token_service(cached: bool) -> TokenService:
+    return TokenService(
+        key_ring=build_key_ring(settings),
+        access_token_expire_minutes=settings.jwt_access_token_expire_minutes,
+        refresh_token_expire_days=settings.jwt_refresh_token_expire_days,
+        cache=TTLCache(max_size=settings.token_cache_max_size) if cached else None,
+    )
+
+
+def run(rounds: int, number: int, bcrypt_number: int) -> list[dict]:
+    uncached = make_token_service(cached=False)
+    cached = make_token_service(cached=True)
+    token = uncached.create_access_token(PAYLOAD)
+    password = "correct horse battery staple"
+    hashed_password = get_password_hash(password)
+
+    return [
+        measure(
+            "token_service.create_access_token",
+            lambda: uncached.create_access_token(PAYLOAD),
+            rounds,
+            number,
+        ),
+        measure(
+            "token_service.decode_token[uncached]",
+            lambda: uncached.decode_token(token, expected_type="access"),
+            rounds,
+            number,
+        ),
+        measure(
+            "token_service.decode_token[cached]",
+            lambda: cached.decode_token(token, expected_type="access"),
+            rounds,
+            number,
+        ),
+        measure(
+            "security.verify_password",
+            lambda: verify_password(password, hashed_password),
+            rounds,
+            bcrypt_number,
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument(
+        "--bcrypt-number",
+        type=int,
+        default=5,
+        help="Calls per round for password verification, which is slow",
+    )
+    parser.add_argument("--output", type=Path, help="Write JSON here, not stdout")
+    args = parser.parse_args()
+
+    results = run(args.rounds, args.number, args.bcrypt_number)
+    write_report("micro", results, args.output)
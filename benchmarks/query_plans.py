@@ -0,0 +1,234 @@
+"""
+Check the query plans of every statement UserService issues.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.query_plans --budget-ms 5 \\
+        --output plans.json
+
+Each UserService method is called against DATABASE_URL inside a
+transaction that is rolled back, and the SQL it sends is captured. Every
+captured statement is then run under EXPLAIN (ANALYZE, BUFFERS), again in a
+rolled-back transaction. The run fails with exit status 1 when a plan scans
+the users table sequentially or a statement exceeds the latency budget.
+
+Meant for a table filled to production scale with benchmarks.generate_users;
+on a near-empty table Postgres rightly prefers sequential scans. That need
+for a populated database is why this is a standalone check (`just
+query-plans`) rather than part of the unit tests under tests/ (`just test`).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from benchmarks.report import write_report
+from core.config import settings
+from core.schemas.user import UserCreate
+from db.models import User
+from services.user_service import UserService
+
+CHECKED_TABLES = {"users"}
+EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+DATA_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class PlanCheck:
+    """EXPLAIN ANALYZE outcome of one captured statement."""
+
+    case: str
+    statement: str
+    execution_ms: float
+    planning_ms: float
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    seq_scans: list[str] = field(default_factory=list)
+    over_budget: bool = False
+    plan: dict | None = None
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.seq_scans) or self.over_budget
+
+
+class StatementRecorder:
+    """Captures the SQL and parameters an engine sends while recording."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.statements: list[tuple[str, tuple]] = []
+        self._active = False
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active and statement.lstrip().upper().startswith(DATA_STATEMENTS):
+            self.statements.append((statement, parameters))
+
+    @contextmanager
+    def recording(self) -> Iterator[list[tuple[str, tuple]]]:
+        self.statements = []
+        self._active = True
+        try:
+            yield self.statements
+        finally:
+            self._active = False
+
+
+def _walk(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+async def _sample_user(engine: AsyncEngine) -> tuple[int, str]:
+    """Pick an existing user near a random id, using the primary key only."""
+    async with AsyncSession(engine) as session:
+        max_id = await session.scalar(select(func.max(User.id)))
+        if max_id is None:
+            raise SystemExit("users is empty; fill it with benchmarks.generate_users")
+        row = (
+            await session.execute(
+                select(User.id, User.email)
+                .where(User.id >= func.floor(func.random() * max_id))
+                .order_by(User.id)
+                .limit(1)
+            )
+        ).one()
+    return row.id, row.email
+
+
+def build_cases(
+    service: UserService,
+    user_id: int,
+    email: str,
+) -> dict[str, Callable[[AsyncSession], Awaitable[object]]]:
+    """One call per UserService query, against an existing user."""
+    new_user = UserCreate(
+        first_name="Plan",
+        last_name="Check",
+        username=f"plan_check_{uuid.uuid4().hex}",
+        email=f"plan-check-{uuid.uuid4().hex}@example.com",
+        password="plan-check-password",
+    )
+    return {
+        "get_user_snapshot": lambda s: service.get_user_snapshot(s, user_id),
+        "get_login_record": lambda s: service.get_login_record(s, email),
+        "create_user": lambda s: service.create_user(s, new_user),
+    }
+
+
+async def capture(
+    engine: AsyncEngine,
+    recorder: StatementRecorder,
+    call: Callable[[AsyncSession], Awaitable[object]],
+) -> list[tuple[str, tuple]]:
+    """Run a service call in a rolled-back transaction and return its SQL."""
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        # Commits inside the service only release a savepoint
+        session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            with recorder.recording() as statements:
+                await call(session)
+        finally:
+            await session.close()
+            await transaction.rollback()
+    return statements
+
+
+async def explain(
+    engine: AsyncEngine,
+    case: str,
+    statement: str,
+    parameters: tuple,
+    budget_ms: float,
+    repeat: int,
+) -> PlanCheck:
+    """EXPLAIN ANALYZE a statement, keeping the fastest of repeat runs."""
+    best: dict | None = None
+    for _ in range(repeat):
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                result = await conn.exec_driver_sql(EXPLAIN + statement, parameters)
+                raw = result.scalar_one()
+            finally:
+                await transaction.rollback()
+        (plan,) = json.loads(raw) if isinstance(raw, str) else raw
+        if best is None or plan["Execution Time"] < best["Execution Time"]:
+            best = plan
+
+    nodes = list(_walk(best["Plan"]))
+    return PlanCheck(
+        case=case,
+        statement=statement,
+        execution_ms=best["Execution Time"],
+        planning_ms=best["Planning Time"],
+        shared_hit_blocks=sum(n.get("Shared Hit Blocks", 0) for n in nodes),
+        shared_read_blocks=sum(n.get("Shared Read Blocks", 0) for n in nodes),
+        seq_scans=[
+            node["Relation Name"]
+            for node in nodes
+            if node["Node Type"] == "Seq Scan"
+            and node.get("Relation Name") in CHECKED_TABLES
+        ],
+        over_budget=best["Execution Time"] > budget_ms,
+        plan=best["Plan"],
+    )
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = create_async_engine(settings.database_url)
+    recorder = StatementRecorder(engine)
+    service = UserService(cache=None)
+    checks: list[PlanCheck] = []
+    try:
+        cases = build_cases(service, *await _sample_user(engine))
+        for case, call in cases.items():
+            for statement, parameters in await capture(engine, recorder, call):
+                checks.append(
+                    await explain(
+                        engine,
+                        case,
+                        statement,
+                        parameters,
+                        args.budget_ms,
+                        args.repeat,
+                    )
+                )
+    finally:
+        await engine.dispose()
+
+    results = []
+    for check in checks:
+        result = asdict(check)
+        if not args.include_plans:
+            del result["plan"]
+        result["failed"] = check.failed
+        results.append(result)
+        if check.failed:
+            reasons = [f"seq scan on {table}" for table in check.seq_scans]
+            if check.over_budget:
+                reasons.append(f"{check.execution_ms:.2f}ms > {args.budget_ms}ms")
+            print(f"FAIL {check.case}: {', '.join(reasons)}", file=sys.stderr)
+
+    write_report("query_plans", results, args.output)
+    return 1 if any(check.failed for check in checks) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--include-plans", action="store_true")
+    parser.add_argument("--output", type=Path, help="Write JSON here, not stdout")
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,107 @@
+"""add_refresh_sessions
+
+Revision ID: defc93f0659b
+Revises: 1bc09d359200
+Create Date: 2026-10-17 10:15:42.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "defc93f0659b"
+down_revision: Union[str, Sequence[str], None] = "1bc09d359200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "refresh_sessions",
+        sa.Column("jti", sa.Uuid(), nullable=False),
+        sa.Column("family_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("rotated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("replaced_by", sa.Uuid(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        op.f("ix_refresh_sessions_expires_at"),
+        "refresh_sessions",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_sessions_family_id"),
+        "refresh_sessions",
+        ["family_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_sessions_user_id"),
+        "refresh_sessions",
+        ["user_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "revoked_sessions",
+        sa.Column("family_id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column(
+            "revoked_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("family_id"),
+    )
+    op.create_index(
+        op.f("ix_revoked_sessions_expires_at"),
+        "revoked_sessions",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_revoked_sessions_revoked_at"),
+        "revoked_sessions",
+        ["revoked_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_revoked_sessions_revoked_at"), table_name="revoked_sessions"
+    )
+    op.drop_index(
+        op.f("ix_revoked_sessions_expires_at"), table_name="revoked_sessions"
+    )
+    op.drop_table("revoked_sessions")
+    op.drop_index(
+        op.f("ix_refresh_sessions_user_id"), table_name="refresh_sessions"
+    )
+    op.drop_index(
+        op.f("ix_refresh_sessions_family_id"), table_name="refresh_sessions"
+    )
+    op.drop_index(
+        op.f("ix_refresh_sessions_expires_at"), table_name="refresh_sessions"
+    )
+    op.drop_table("refresh_sessions")
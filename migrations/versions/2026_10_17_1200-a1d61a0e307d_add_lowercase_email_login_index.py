@@ -0,0 +1,100 @@
+"""add_lowercase_email_login_index
+
+Revision ID: a1d61a0e307d
+Revises: defc93f0659b
+Create Date: 2026-10-17 12:00:31.402917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a1d61a0e307d"
+down_revision: Union[str, Sequence[str], None] = "defc93f0659b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Everything a login reads, so it is answered by an index-only scan
+LOGIN_COLUMNS = ["id", "email", "hashed_password", "is_active"]
+
+# How many case-variant duplicates to list when the upgrade refuses to run
+MAX_REPORTED_DUPLICATES = 20
+
+
+def check_case_duplicates() -> None:
+    """Fail with the offending emails if any differ only in case."""
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT lower(email) AS email, count(*) AS users FROM users "
+                "GROUP BY lower(email) HAVING count(*) > 1 "
+                "ORDER BY lower(email) LIMIT :limit"
+            ),
+            {"limit": MAX_REPORTED_DUPLICATES},
+        )
+        .all()
+    )
+    if duplicates:
+        listed = "\n".join(f"  {row.email} ({row.users} users)" for row in duplicates)
+        raise RuntimeError(
+            "Cannot add a case-insensitive unique index on users.email: these "
+            f"emails are registered more than once in different case (first "
+            f"{MAX_REPORTED_DUPLICATES} shown). Merge or rename the accounts, "
+            f"then rerun the migration.\n{listed}"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    check_case_duplicates()
+
+    # CONCURRENTLY can't run inside a transaction. It builds the index
+    # without blocking writes to users, but a failed build (for example on
+    # a case-variant duplicate registered after the check) leaves an
+    # invalid index behind, so any leftover from an earlier attempt is
+    # dropped first.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_email_lower",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            "ix_users_email_lower",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_include=LOGIN_COLUMNS,
+            postgresql_concurrently=True,
+        )
+        # Duplicates the primary key index
+        op.drop_index(
+            "ix_users_id",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_id",
+            "users",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_users_email_lower",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""add_users_created_at_index
+
+Revision ID: ab7832d4c850
+Revises: a1d61a0e307d
+Create Date: 2026-10-17 14:00:12.583041
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ab7832d4c850"
+down_revision: Union[str, Sequence[str], None] = "a1d61a0e307d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The email filter syncs recently created users by created_at
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_created_at",
+            "users",
+            ["created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_created_at",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,112 @@
+"""
+Bulk-import users from a CSV or NDJSON file.
+
+Usage:
+    python -m commands.import_users users.csv --issues issues.ndjson
+
+Rows need first_name, last_name, username and email, plus either a plain
+password (hashed in the worker pool) or an existing bcrypt hashed_password.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import asdict
+from pathlib import Path
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from core.config import settings
+from core.hashing import password_hasher
+from core.logging_config import setup_logging
+from services.user_import_service import (
+    ImportIssue,
+    RejectedRow,
+    user_import_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(
+    path: Path,
+    file_format: str,
+) -> Iterator[tuple[int, dict | RejectedRow]]:
+    """
+    Stream rows from the input file without loading it into memory.
+
+    Each row comes with its line number in the file, so issues point at
+    the exact record. Malformed NDJSON lines are yielded as RejectedRow,
+    so they are reported instead of aborting the import.
+    """
+    with path.open(newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Empty CSV cells mean "not provided"
+                values = {key: value for key, value in row.items() if value != ""}
+                # The last line of the record, for values spanning lines
+                yield reader.line_num, values
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, RejectedRow(reason=f"Invalid JSON: {e.msg}")
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """Convert the SQLAlchemy database URL into a plain asyncpg DSN."""
+    url = make_url(database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def main(args: argparse.Namespace) -> None:
+    file_format = args.format or (
+        "csv" if args.path.suffix.lower() == ".csv" else "ndjson"
+    )
+
+    issues_file = args.issues.open("w", encoding="utf-8") if args.issues else None
+
+    def on_issue(issue: ImportIssue) -> None:
+        if issues_file is not None:
+            issues_file.write(json.dumps(asdict(issue)) + "\n")
+
+    password_hasher.start()
+    # A dedicated connection keeps the temp staging table across batches
+    conn = await asyncpg.connect(asyncpg_dsn(settings.database_url))
+    try:
+        report = await user_import_service.import_users(
+            conn,
+            read_rows(args.path, file_format),
+            batch_size=args.batch_size,
+            on_issue=on_issue,
+        )
+    finally:
+        await conn.close()
+        password_hasher.shutdown()
+        if issues_file is not None:
+            issues_file.close()
+
+    print(json.dumps(asdict(report)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import users")
+    parser.add_argument("path", type=Path, help="CSV or NDJSON input file")
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument(
+        "--issues",
+        type=Path,
+        help="Write rejected and conflicting rows to this NDJSON file",
+    )
+
+    setup_logging()
+    asyncio.run(main(parser.parse_args()))
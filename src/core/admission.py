@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from core.exceptions import ServiceOverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """
+    Bounded concurrency limiter with a bounded FIFO wait queue.
+
+    Requests beyond the in-flight limit wait in a queue of at most
+    ``max_queue`` entries for at most ``queue_timeout`` seconds, and are
+    rejected with ServiceOverloadedError otherwise. Rejection happens before
+    any work is done, so an overloaded caller pays almost nothing.
+
+    When a latency source is given, the in-flight limit adapts to it using a
+    gradient rule: the limit shrinks as observed latency rises above the
+    best latency seen recently, and grows again once latency recovers.
+    """
+
+    _ADJUST_INTERVAL_SECONDS = 1.0
+    # How quickly the baseline forgets an old, unrealistically low latency
+    _BASELINE_DECAY = 1.01
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        min_in_flight: int = 1,
+        latency_source: Callable[[], float] | None = None,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min(min_in_flight, max_in_flight)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.limit = max_in_flight
+        self.in_flight = 0
+        self.rejected = 0
+        self._latency_source = latency_source
+        self._baseline_latency = 0.0
+        self._last_adjusted = time.monotonic()
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self._waiters)
+
+    @property
+    def saturated(self) -> bool:
+        """True when every slot is taken or requests are already waiting."""
+        return self.in_flight >= self.limit or bool(self._waiters)
+
+    def _retry_after(self) -> float:
+        """Estimate how long until a rejected caller would be served."""
+        latency = self._latency_source() if self._latency_source else 0.0
+        backlog = self.in_flight + len(self._waiters)
+        return max(1.0, backlog * latency / max(self.limit, 1))
+
+    def _reject(self) -> ServiceOverloadedError:
+        self.rejected += 1
+        return ServiceOverloadedError(self.name, math.ceil(self._retry_after()))
+
+    def _adjust_limit(self) -> None:
+        now = time.monotonic()
+        if (
+            self._latency_source is None
+            or now - self._last_adjusted < self._ADJUST_INTERVAL_SECONDS
+        ):
+            return
+        self._last_adjusted = now
+
+        latency = self._latency_source()
+        if latency <= 0:
+            return
+        if not self._baseline_latency or latency < self._baseline_latency:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency *= self._BASELINE_DECAY
+
+        gradient = max(0.5, min(1.0, self._baseline_latency / latency))
+        new_limit = int(self.limit * gradient + math.sqrt(self.limit))
+        new_limit = max(self.min_in_flight, min(self.max_in_flight, new_limit))
+        if new_limit != self.limit:
+            logger.debug(f"{self.name} admission limit {self.limit} -> {new_limit}")
+            self.limit = new_limit
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._adjust_limit()
+        self._wake_waiters()
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                raise self._reject() from e
+            raise
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the block.
+
+        Raises:
+            ServiceOverloadedError: If no slot frees up before the deadline
+                or the wait queue is full
+        """
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
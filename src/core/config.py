@@ -1,6 +1,8 @@
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+HMAC_ALGORITHMS = ("HS256", "HS384", "HS512")
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -12,17 +14,106 @@ class Settings(BaseSettings):
         ...,
         description="Database connection URL",
     )
+    database_replica_urls: list[str] = Field(
+        default=[],
+        description="Read replica connection URLs; all reads use the primary if empty",
+    )
+    replica_max_lag_seconds: float = Field(
+        default=5.0,
+        description="Replicas replaying further behind are taken out of rotation",
+        gt=0,
+    )
+    replica_health_check_interval_seconds: float = Field(
+        default=2.0,
+        description="How often replica health and replay lag are checked",
+        gt=0,
+    )
+    replica_recent_writers_max_size: int = Field(
+        default=100_000,
+        description="Recently written users tracked to read their writes",
+        gt=0,
+    )
+    db_echo: bool = Field(
+        default=False,
+        description="Log every SQL statement; for local debugging only",
+    )
+    db_pool_size: int = Field(
+        default=5,
+        description="Connections kept open in the database pool",
+        gt=0,
+    )
+    db_max_overflow: int = Field(
+        default=10,
+        description="Extra connections opened beyond the pool size under load",
+        ge=0,
+    )
+    db_pool_timeout_seconds: float = Field(
+        default=30.0,
+        description="How long a checkout waits for a free connection before failing",
+        gt=0,
+    )
+    db_pool_pre_ping: bool = Field(
+        default=False,
+        description="Test connections with a round trip on every checkout",
+    )
+    db_pool_recycle_seconds: int = Field(
+        default=1800,
+        description="Replace pooled connections older than this; -1 never does",
+        ge=-1,
+    )
+    db_statement_cache_size: int = Field(
+        default=100,
+        description="Prepared statements cached per asyncpg connection; 0 disables",
+        ge=0,
+    )
+    db_transaction_pooler: bool = Field(
+        default=False,
+        description=(
+            "Connect through a transaction-mode pooler such as PgBouncer; "
+            "turns off the prepared statement caches, which it can't support"
+        ),
+    )
+    db_connection_hold_warning_seconds: float = Field(
+        default=5.0,
+        description=(
+            "Log a warning when a connection is returned after being checked "
+            "out for this long"
+        ),
+        gt=0,
+    )
 
     # JWT Configuration
-    jwt_secret_key: str = Field(
-        ...,
-        description="Secret key for JWT token generation",
+    jwt_secret_key: str | None = Field(
+        default=None,
+        description="Secret key for HMAC (HS*) JWT token generation",
         min_length=32,
     )
+    jwt_private_key: str | None = Field(
+        default=None,
+        description="PEM-encoded private key for RS*/ES*/EdDSA token signing",
+    )
     jwt_algorithm: str = Field(
         default="HS256",
         description="Algorithm for JWT token generation",
     )
+    jwt_key_id: str = Field(
+        default="primary",
+        description="kid header for the single configured signing key",
+    )
+    jwt_keys_dir: str | None = Field(
+        default=None,
+        description="Directory of rotating signing keys; overrides the single key",
+    )
+    jwt_keys_reload_interval_seconds: float = Field(
+        default=30.0,
+        description="How often JWT_KEYS_DIR is checked for changes",
+        gt=0,
+    )
+    jwks_cache_max_age_seconds: int = Field(
+        default=300,
+        description="Cache-Control max-age for the JWKS document",
+        ge=0,
+    )
     jwt_access_token_expire_minutes: int = Field(
         default=30,
         description="Access token expiration time in minutes",
@@ -36,6 +127,250 @@ class Settings(BaseSettings):
         le=30,  # Max 30 days
     )
 
+    # Caching
+    token_cache_max_size: int = Field(
+        default=10_000,
+        description="Maximum number of verified tokens cached in memory (0 disables)",
+        ge=0,
+    )
+    user_cache_max_size: int = Field(
+        default=10_000,
+        description="Maximum number of user snapshots cached in memory (0 disables)",
+        ge=0,
+    )
+    user_cache_ttl_seconds: float = Field(
+        default=30.0,
+        description="How long a cached user snapshot may be served",
+        gt=0,
+    )
+
+    # Password hashing
+    password_hash_executor: str = Field(
+        default="process",
+        description="Worker pool used for bcrypt (process or thread)",
+    )
+    password_hash_workers: int | None = Field(
+        default=None,
+        description="Number of password hashing workers (defaults to CPU count)",
+        gt=0,
+    )
+
+    # Login admission control
+    login_max_in_flight: int | None = Field(
+        default=None,
+        description="Maximum concurrent logins (defaults to 2x hashing workers)",
+        gt=0,
+    )
+    login_min_in_flight: int = Field(
+        default=1,
+        description="Lower bound for the adaptive login concurrency limit",
+        gt=0,
+    )
+    login_max_queue: int = Field(
+        default=256,
+        description="Maximum logins waiting for a slot before shedding",
+        ge=0,
+    )
+    login_queue_timeout_seconds: float = Field(
+        default=1.0,
+        description="Maximum time a login waits for a slot before shedding",
+        gt=0,
+    )
+
+    # Credential endpoint rate limits
+    rate_limit_ip_requests: int = Field(
+        default=60,
+        description="Credential requests allowed per client IP per window",
+        gt=0,
+    )
+    rate_limit_ip_window_seconds: float = Field(
+        default=60.0,
+        description="Sliding window for per-IP credential rate limits",
+        gt=0,
+    )
+    rate_limit_email_requests: int = Field(
+        default=10,
+        description="Login attempts allowed per email per window",
+        gt=0,
+    )
+    rate_limit_email_window_seconds: float = Field(
+        default=300.0,
+        description="Sliding window for per-email login rate limits",
+        gt=0,
+    )
+    rate_limit_max_keys: int = Field(
+        default=1_000_000,
+        description="Maximum identities tracked by the in-memory rate limiter",
+        gt=0,
+    )
+    trusted_proxy_count: int = Field(
+        default=0,
+        description=(
+            "Reverse proxies in front of the service; the client IP is taken "
+            "from X-Forwarded-For this many hops from the right (0 ignores it)"
+        ),
+        ge=0,
+    )
+
+    # Refresh sessions
+    revocation_sync_interval_seconds: float = Field(
+        default=1.0,
+        description="How often revoked sessions are loaded from the database",
+        gt=0,
+    )
+
+    # Expired session cleanup
+    reaper_interval_seconds: float = Field(
+        default=300.0,
+        description="How often expired sessions and revocations are deleted",
+        gt=0,
+    )
+    reaper_batch_size: int = Field(
+        default=5000,
+        description="Maximum rows deleted per cleanup transaction",
+        gt=0,
+    )
+    reaper_batch_pause_seconds: float = Field(
+        default=0.05,
+        description="Pause between cleanup batches",
+        ge=0,
+    )
+    reaper_busy_backoff_seconds: float = Field(
+        default=1.0,
+        description="Pause before the next cleanup batch while logins are queued",
+        gt=0,
+    )
+
+    # Registered email filter
+    email_filter_enabled: bool = Field(
+        default=True,
+        description="Skip login lookups for emails that are definitely unknown",
+    )
+    email_filter_error_rate: float = Field(
+        default=0.01,
+        description="Target false positive rate of the registered email filter",
+        gt=0,
+        lt=1,
+    )
+    email_filter_sync_interval_seconds: float = Field(
+        default=1.0,
+        description="How often users inserted elsewhere are added to the filter",
+        gt=0,
+    )
+    email_filter_sync_overlap_seconds: float = Field(
+        default=60.0,
+        description=(
+            "How far back each email filter sync re-reads new users; must "
+            "exceed the longest transaction that inserts users"
+        ),
+        gt=0,
+    )
+    email_filter_rebuild_interval_seconds: float = Field(
+        default=3600.0,
+        description="How often the email filter is rebuilt from scratch",
+        gt=0,
+    )
+
+    # Tracing
+    tracing_exporter: str | None = Field(
+        default=None,
+        description="Where sampled traces go (file or http); unset disables tracing",
+    )
+    tracing_file_path: str = Field(
+        default="traces.ndjson",
+        description="File the file exporter appends spans to, one JSON per line",
+    )
+    tracing_endpoint: str | None = Field(
+        default=None,
+        description="URL the http exporter posts span batches to",
+    )
+    tracing_sample_rate: float = Field(
+        default=0.01,
+        description="Share of ordinary requests whose traces are kept",
+        ge=0,
+        le=1,
+    )
+    tracing_slow_threshold_ms: float = Field(
+        default=250.0,
+        description="Requests at least this slow count as slow for sampling",
+        gt=0,
+    )
+    tracing_slow_sample_rate: float = Field(
+        default=1.0,
+        description="Share of slow requests whose traces are kept",
+        ge=0,
+        le=1,
+    )
+    tracing_error_sample_rate: float = Field(
+        default=1.0,
+        description="Share of failed requests whose traces are kept",
+        ge=0,
+        le=1,
+    )
+    tracing_max_spans_per_trace: int = Field(
+        default=256,
+        description="Spans recorded per trace before further spans are dropped",
+        gt=0,
+    )
+    tracing_export_interval_seconds: float = Field(
+        default=1.0,
+        description="How often buffered spans are exported",
+        gt=0,
+    )
+
+    # Request profiling
+    profiler_secret: str | None = Field(
+        default=None,
+        description="HMAC secret for profiling trigger tokens; unset disables them",
+        min_length=32,
+    )
+    profiler_sample_one_in: int | None = Field(
+        default=None,
+        description="Profile one in this many requests at random; unset disables",
+        gt=0,
+    )
+    profiler_interval_ms: float = Field(
+        default=5.0,
+        description="Stack sampling interval of the request profiler",
+        gt=0,
+    )
+    profiler_max_concurrent: int = Field(
+        default=2,
+        description="Maximum requests profiled at the same time",
+        gt=0,
+    )
+    profiler_max_profiles: int = Field(
+        default=100,
+        description="Number of recent profiles kept for download",
+        gt=0,
+    )
+    profiler_max_duration_seconds: float = Field(
+        default=30.0,
+        description="Sampling of a single request stops after this long",
+        gt=0,
+    )
+
+    # Event loop monitoring
+    loop_monitor_enabled: bool = Field(
+        default=True,
+        description="Measure event loop lag and report blocking calls",
+    )
+    loop_monitor_interval_ms: float = Field(
+        default=100.0,
+        description="How often the event loop lag is sampled",
+        gt=0,
+    )
+    loop_block_threshold_ms: float = Field(
+        default=100.0,
+        description="Callbacks holding the loop this long are logged with a stack",
+        gt=0,
+    )
+    loop_block_log_interval_seconds: float = Field(
+        default=60.0,
+        description="Minimum time between reports for the same blocking call site",
+        gt=0,
+    )
+
     # Logging
     log_level: str = Field(
         default="INFO",
@@ -46,11 +381,61 @@ class Settings(BaseSettings):
     @classmethod
     def validate_algorithm(cls, v: str) -> str:
         """Validate JWT algorithm."""
-        allowed = ["HS256", "HS384", "HS512"]
+        allowed = [
+            *HMAC_ALGORITHMS,
+            "RS256",
+            "RS384",
+            "RS512",
+            "ES256",
+            "ES384",
+            "ES512",
+            "EdDSA",
+        ]
         if v not in allowed:
             raise ValueError(f"Algorithm must be one of {allowed}")
         return v
 
+    @model_validator(mode="after")
+    def validate_tracing_endpoint(self) -> "Settings":
+        """Require an endpoint for the http tracing exporter."""
+        if self.tracing_exporter == "http" and not self.tracing_endpoint:
+            raise ValueError("TRACING_ENDPOINT is required for the http exporter")
+        return self
+
+    @model_validator(mode="after")
+    def validate_signing_key(self) -> "Settings":
+        """Validate that the key material matches the JWT algorithm."""
+        if self.jwt_keys_dir:
+            return self
+        if self.jwt_algorithm in HMAC_ALGORITHMS:
+            if not self.jwt_secret_key:
+                raise ValueError(f"{self.jwt_algorithm} requires JWT_SECRET_KEY")
+        elif not self.jwt_private_key:
+            raise ValueError(f"{self.jwt_algorithm} requires JWT_PRIVATE_KEY")
+        return self
+
+    @field_validator("password_hash_executor")
+    @classmethod
+    def validate_password_hash_executor(cls, v: str) -> str:
+        """Validate password hashing executor type."""
+        allowed = ["process", "thread"]
+        v_lower = v.lower()
+        if v_lower not in allowed:
+            raise ValueError(f"Password hash executor must be one of {allowed}")
+        return v_lower
+
+    @field_validator("tracing_exporter")
+    @classmethod
+    def validate_tracing_exporter(cls, v: str | None) -> str | None:
+        """Validate tracing exporter type."""
+        if v is None:
+            return v
+        allowed = ["file", "http"]
+        v_lower = v.lower()
+        if v_lower not in allowed:
+            raise ValueError(f"Tracing exporter must be one of {allowed}")
+        return v_lower
+
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
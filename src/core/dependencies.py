@@ -1,17 +1,20 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.auth_service import auth_service, AuthService
 from services.user_service import user_service, UserService
-from db import db_session_manager
-from db.models import User
+from services.token_service import token_service, TokenService
+from db import db_session_manager, LazySession
+from db.records import UserSnapshot
+from core.config import settings
 from core.exceptions import (
     InvalidTokenError,
+    RateLimitExceededError,
     TokenExpiredError,
     UserNotFoundError,
     InvalidCredentialsError,
 )
+from core.rate_limit import credential_rate_limiter
 
 http_bearer = HTTPBearer()
 
@@ -26,11 +29,16 @@ def get_user_service() -> UserService:
     return user_service
 
 
+def get_token_service() -> TokenService:
+    """Get the token service instance."""
+    return token_service
+
+
 async def get_current_user(
     token: str = Depends(http_bearer),
     auth_service: AuthService = Depends(get_auth_service),
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
-) -> User:
+    session: LazySession = Depends(db_session_manager.get_lazy_session),
+) -> UserSnapshot:
     """
     Dependency to get the current authenticated user from a token.
     
@@ -52,8 +60,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
     """
     Dependency to get the current active user.
     
@@ -70,3 +78,57 @@ async def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+
+async def get_current_superuser(
+    current_user: UserSnapshot = Depends(get_current_active_user),
+) -> UserSnapshot:
+    """
+    Dependency to get the current user if they are a superuser.
+
+    Args:
+        current_user: The current active user
+
+    Returns:
+        The current user if a superuser
+
+    Raises:
+        HTTPException: 403 if the user is not a superuser
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough privileges")
+    return current_user
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Get the client IP, honouring X-Forwarded-For only behind trusted proxies.
+
+    Each proxy appends the address it received the request from, so only the
+    last ``trusted_proxy_count`` entries can be trusted; anything to their
+    left was supplied by the client and may be spoofed.
+    """
+    hops = settings.trusted_proxy_count
+    if hops:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            addresses = [a.strip() for a in forwarded_for.split(",") if a.strip()]
+            if addresses:
+                return addresses[-min(hops, len(addresses))]
+    return request.client.host if request.client else "unknown"
+
+
+async def rate_limit_by_ip(request: Request) -> None:
+    """
+    Dependency that rate limits credential endpoints per client IP.
+
+    Raises:
+        HTTPException: 429 with Retry-After if the IP is over its limit
+    """
+    try:
+        await credential_rate_limiter.check("ip", get_client_ip(request))
+    except RateLimitExceededError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
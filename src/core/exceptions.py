@@ -10,7 +10,10 @@ class AuthServiceException(Exception):
 class UserAlreadyExistsError(AuthServiceException):
     """Raised when trying to create a user that already exists."""
 
-    pass
+    def __init__(self, field: str, value: str):
+        self.field = field
+        self.value = value
+        super().__init__(f"User with {field} {value} already exists")
 
 
 class UserNotFoundError(AuthServiceException):
@@ -37,6 +40,12 @@ class TokenExpiredError(InvalidTokenError):
     pass
 
 
+class RefreshTokenReuseError(InvalidTokenError):
+    """Raised when an already rotated refresh token is presented again."""
+
+    pass
+
+
 class InvalidTokenTypeError(InvalidTokenError):
     """Raised when token type doesn't match expected type."""
 
@@ -44,3 +53,21 @@ class InvalidTokenTypeError(InvalidTokenError):
         self.expected = expected
         self.actual = actual
         super().__init__(f"Expected {expected} token, got {actual}")
+
+
+class ServiceOverloadedError(AuthServiceException):
+    """Raised when a request is shed because the service is saturated."""
+
+    def __init__(self, resource: str, retry_after: int):
+        self.resource = resource
+        self.retry_after = retry_after
+        super().__init__(f"Too many concurrent {resource} requests, retry later")
+
+
+class RateLimitExceededError(AuthServiceException):
+    """Raised when a client exceeds a rate limit."""
+
+    def __init__(self, scope: str, retry_after: int):
+        self.scope = scope
+        self.retry_after = retry_after
+        super().__init__("Too many requests, retry later")
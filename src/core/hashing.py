@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from core.config import settings
+from core.metrics import password_hash_seconds, password_hash_wait_seconds
+from core.tracing import tracer
+from core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_verify(plain_password: str, hashed_password: str) -> tuple[bool, float]:
+    """Worker entry point: verify a password and report time spent hashing."""
+    start = time.perf_counter()
+    result = verify_password(plain_password, hashed_password)
+    return result, time.perf_counter() - start
+
+
+def _timed_hash(password: str) -> tuple[str, float]:
+    """Worker entry point: hash a password and report time spent hashing."""
+    start = time.perf_counter()
+    result = get_password_hash(password)
+    return result, time.perf_counter() - start
+
+
+def _timed_hash_many(passwords: list[str]) -> tuple[list[str], float]:
+    """Worker entry point: hash a chunk of passwords in one round trip."""
+    start = time.perf_counter()
+    result = [get_password_hash(password) for password in passwords]
+    return result, time.perf_counter() - start
+
+
+@dataclass
+class HashingStats:
+    """Counters describing the password hashing worker pool."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    total_wait_seconds: float = 0.0
+    total_hash_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    ewma_hash_seconds: float = 0.0
+    # Queue wait plus hashing, as seen by the caller
+    ewma_latency_seconds: float = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Jobs submitted to the pool that have not finished yet."""
+        return self.submitted - self.completed - self.failed
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification in a worker pool off the event loop."""
+
+    _EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        executor_type: str,
+        max_workers: int | None = None,
+    ):
+        self.executor_type = executor_type
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.stats = HashingStats()
+        self._executor: Executor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self.stats.pending - self.max_workers)
+
+    def start(self) -> None:
+        """Create the worker pool, falling back to threads if processes fail."""
+        if self._executor is not None:
+            return
+
+        if self.executor_type == "process":
+            try:
+                # Spawn rather than fork: the parent runs an event loop and a
+                # gRPC server, neither of which survives a fork.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(
+                    f"Process pool unavailable, falling back to threads: {str(e)}"
+                )
+
+        if self._executor is None:
+            # bcrypt releases the GIL, so threads still keep the loop free
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher",
+            )
+
+        logger.info(
+            f"Password hasher started with {self.max_workers} "
+            f"{type(self._executor).__name__} workers"
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, cancelling jobs that have not started."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def _run(self, func, *args, items: int = 1):
+        if self._executor is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        operation = func.__name__.removeprefix("_timed_")
+        self.stats.submitted += 1
+        start = time.perf_counter()
+        try:
+            with tracer.span(f"password_hash.{operation}", items=items):
+                result, hash_seconds = await loop.run_in_executor(
+                    self._executor, func, *args
+                )
+        except BaseException:
+            self.stats.failed += 1
+            raise
+
+        latency = time.perf_counter() - start
+        password_hash_seconds.labels(operation=operation).observe(hash_seconds)
+        password_hash_wait_seconds.labels(operation=operation).observe(
+            max(0.0, latency - hash_seconds)
+        )
+        stats = self.stats
+        stats.completed += 1
+        stats.total_hash_seconds += hash_seconds
+        stats.total_wait_seconds += max(0.0, latency - hash_seconds)
+        stats.max_latency_seconds = max(stats.max_latency_seconds, latency)
+        per_item_seconds = hash_seconds / items
+        stats.ewma_hash_seconds = self._ewma(stats.ewma_hash_seconds, per_item_seconds)
+        stats.ewma_latency_seconds = self._ewma(
+            stats.ewma_latency_seconds,
+            latency - hash_seconds + per_item_seconds,
+        )
+        return result
+
+    def _ewma(self, average: float, sample: float) -> float:
+        if not average:
+            return sample
+        return average + self._EWMA_ALPHA * (sample - average)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plain password against a hashed password in the worker pool.
+
+        Args:
+            plain_password: The plain text password
+            hashed_password: The hashed password to verify against
+
+        Returns:
+            True if password matches, False otherwise
+        """
+        return await self._run(_timed_verify, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with bcrypt in the worker pool.
+
+        Args:
+            password: The plain text password to hash
+
+        Returns:
+            The hashed password
+        """
+        return await self._run(_timed_hash, password)
+
+    async def hash_many(
+        self,
+        passwords: Sequence[str],
+        chunk_size: int = 32,
+    ) -> list[str]:
+        """
+        Hash many passwords across all workers.
+
+        Passwords are sent to the pool in chunks to amortize the cost of
+        shipping work to worker processes.
+
+        Args:
+            passwords: Plain text passwords
+            chunk_size: Passwords hashed per worker job
+
+        Returns:
+            The hashed passwords, in input order
+        """
+        chunks = [
+            list(passwords[i : i + chunk_size])
+            for i in range(0, len(passwords), chunk_size)
+        ]
+        results = await asyncio.gather(
+            *(self._run(_timed_hash_many, chunk, items=len(chunk)) for chunk in chunks)
+        )
+        return [hashed for chunk in results for hashed in chunk]
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.password_hash_executor,
+    max_workers=settings.password_hash_workers,
+)
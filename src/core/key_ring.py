@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from core.config import HMAC_ALGORITHMS, Settings
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_KEY_FILE = "active"
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    """A JWT key whose key objects were prepared once, up front."""
+
+    kid: str
+    algorithm: str
+    verifying_key: Any
+    signing_key: Any | None = None
+    public_key: Any | None = None
+
+    @classmethod
+    def from_secret(cls, kid: str, algorithm: str, secret: str) -> "SigningKey":
+        """Build an HMAC key that can both sign and verify."""
+        prepared = jwt.get_algorithm_by_name(algorithm).prepare_key(secret)
+        return cls(
+            kid=kid,
+            algorithm=algorithm,
+            verifying_key=prepared,
+            signing_key=prepared,
+        )
+
+    @classmethod
+    def from_private_key(cls, kid: str, algorithm: str, pem: str) -> "SigningKey":
+        """Build an asymmetric key pair from a PEM-encoded private key."""
+        private_key = jwt.get_algorithm_by_name(algorithm).prepare_key(pem)
+        public_key = private_key.public_key()
+        return cls(
+            kid=kid,
+            algorithm=algorithm,
+            verifying_key=public_key,
+            signing_key=private_key,
+            public_key=public_key,
+        )
+
+    @classmethod
+    def from_public_key(cls, kid: str, algorithm: str, pem: str) -> "SigningKey":
+        """Build a verify-only key from a PEM-encoded public key."""
+        public_key = jwt.get_algorithm_by_name(algorithm).prepare_key(pem)
+        return cls(
+            kid=kid,
+            algorithm=algorithm,
+            verifying_key=public_key,
+            public_key=public_key,
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Digest of the algorithm and verification key material.
+
+        Keys loaded again from unchanged files are new objects but have the
+        same fingerprint, so a reload can tell which keys actually changed.
+        """
+        if isinstance(self.verifying_key, bytes):
+            material = self.verifying_key
+        else:
+            material = self.verifying_key.public_bytes(
+                Encoding.DER, PublicFormat.SubjectPublicKeyInfo
+            )
+        return hashlib.sha256(self.algorithm.encode() + b":" + material).hexdigest()
+
+    def to_jwk(self) -> dict | None:
+        """Return the public JWK for this key, or None for HMAC secrets."""
+        if self.public_key is None:
+            return None
+        jwk = jwt.get_algorithm_by_name(self.algorithm).to_jwk(
+            self.public_key, as_dict=True
+        )
+        jwk.update({"kid": self.kid, "use": "sig", "alg": self.algorithm})
+        return jwk
+
+
+class KeyRing:
+    """
+    Set of verification keys with one active signing key.
+
+    Tokens carry the signing key's ``kid`` header, so several keys can be
+    accepted at once and a new key can be promoted without invalidating
+    tokens signed by the previous one.
+    """
+
+    def __init__(self, keys: Iterable[SigningKey], active_kid: str):
+        self.version = 0
+        self._keys: dict[str, SigningKey] = {}
+        self._active: SigningKey | None = None
+        self.replace(keys, active_kid)
+
+    @property
+    def active(self) -> SigningKey:
+        """The key new tokens are signed with."""
+        return self._active
+
+    def get(self, kid: str) -> SigningKey | None:
+        """Look up a verification key by id."""
+        return self._keys.get(kid)
+
+    def __iter__(self):
+        return iter(self._keys.values())
+
+    def replace(self, keys: Iterable[SigningKey], active_kid: str) -> None:
+        """Atomically swap in a new set of keys and active signing key."""
+        keys_by_kid = {key.kid: key for key in keys}
+        active = keys_by_kid.get(active_kid)
+        if active is None or active.signing_key is None:
+            raise ValueError(f"Active key {active_kid!r} has no signing key")
+
+        self._keys = keys_by_kid
+        self._active = active
+        self.version += 1
+
+    def add(self, key: SigningKey) -> None:
+        """Add or replace a verification key."""
+        self.replace([*self._keys.values(), key], self._active.kid)
+
+    def promote(self, kid: str) -> None:
+        """Make an existing key the active signing key."""
+        self.replace(self._keys.values(), kid)
+        logger.info(f"Promoted signing key {kid}")
+
+    def retire(self, kid: str) -> None:
+        """Stop accepting tokens signed with a key."""
+        if kid == self._active.kid:
+            raise ValueError("Cannot retire the active signing key")
+        self.replace(
+            (key for key in self._keys.values() if key.kid != kid),
+            self._active.kid,
+        )
+
+
+def load_keys_from_directory(
+    path: Path,
+    algorithm: str,
+) -> tuple[list[SigningKey], str]:
+    """
+    Load keys from a directory.
+
+    Each key is a file named after its kid: ``<kid>.secret`` for HMAC
+    secrets, ``<kid>.pem`` for private keys and ``<kid>.pub.pem`` for
+    verify-only public keys. Only the files that apply to the algorithm
+    are loaded, so a directory may hold keys for other algorithms too. The
+    ``active`` file holds the signing kid.
+
+    Returns:
+        The keys and the active kid
+    """
+    keys = []
+    hmac = algorithm in HMAC_ALGORITHMS
+    for file in sorted(path.iterdir()):
+        name = file.name
+        if hmac:
+            if not name.endswith(".secret"):
+                continue
+            kid = name.removesuffix(".secret")
+            key = SigningKey.from_secret(kid, algorithm, file.read_text().strip())
+        elif name.endswith(".pub.pem"):
+            kid = name.removesuffix(".pub.pem")
+            key = SigningKey.from_public_key(kid, algorithm, file.read_text())
+        elif name.endswith(".pem"):
+            kid = name.removesuffix(".pem")
+            key = SigningKey.from_private_key(kid, algorithm, file.read_text())
+        else:
+            continue
+        keys.append(key)
+
+    active_kid = (path / ACTIVE_KEY_FILE).read_text().strip()
+    return keys, active_kid
+
+
+def build_key_ring(settings: Settings) -> KeyRing:
+    """Build the key ring from JWT_KEYS_DIR, or from the single configured key."""
+    if settings.jwt_keys_dir:
+        keys, active_kid = load_keys_from_directory(
+            Path(settings.jwt_keys_dir), settings.jwt_algorithm
+        )
+        return KeyRing(keys, active_kid)
+
+    if settings.jwt_algorithm in HMAC_ALGORITHMS:
+        key = SigningKey.from_secret(
+            settings.jwt_key_id, settings.jwt_algorithm, settings.jwt_secret_key
+        )
+    else:
+        key = SigningKey.from_private_key(
+            settings.jwt_key_id, settings.jwt_algorithm, settings.jwt_private_key
+        )
+    return KeyRing([key], key.kid)
+
+
+def _directory_fingerprint(path: Path) -> tuple:
+    fingerprint = []
+    for file in sorted(path.iterdir()):
+        stat = file.stat()
+        fingerprint.append((file.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+async def watch_key_directory(
+    key_ring: KeyRing,
+    path: Path,
+    algorithm: str,
+    interval: float,
+) -> None:
+    """
+    Reload the key ring whenever the key directory changes.
+
+    Promoting a key is a matter of adding its file and rewriting ``active``;
+    no restart is needed. A directory that fails to load keeps the current
+    keys in place.
+    """
+    fingerprint = await asyncio.to_thread(_directory_fingerprint, path)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            current = await asyncio.to_thread(_directory_fingerprint, path)
+            if current == fingerprint:
+                continue
+            keys, active_kid = await asyncio.to_thread(
+                load_keys_from_directory, path, algorithm
+            )
+            key_ring.replace(keys, active_kid)
+            fingerprint = current
+            logger.info(
+                f"Reloaded {len(keys)} signing keys, active key is {active_kid}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to reload signing keys from {path}: {str(e)}")
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from core.config import settings
+from core.metrics import event_loop_blocks, event_loop_lag_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag and reports callbacks that block the loop.
+
+    A heartbeat task sleeps for a fixed interval and records how late it
+    wakes up. A watchdog thread checks the heartbeat; when it has not moved
+    for longer than the threshold, the loop is stuck in a single callback,
+    so the loop thread's stack at that moment shows the offending call.
+    Reports are rate limited per blocking call site.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        block_threshold: float,
+        log_interval: float,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.log_interval = log_interval
+        self._loop_thread_id: int | None = None
+        self._heartbeat = time.monotonic()
+        self._stop = threading.Event()
+        self._last_logged: dict[tuple[str, int], float] = {}
+        self._suppressed: dict[tuple[str, int], int] = {}
+
+    def _report(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        site = (frame.f_code.co_filename, frame.f_lineno)
+        now = time.monotonic()
+        last_logged = self._last_logged.get(site)
+        if last_logged is not None and now - last_logged < self.log_interval:
+            self._suppressed[site] = self._suppressed.get(site, 0) + 1
+            return
+
+        self._last_logged[site] = now
+        suppressed = self._suppressed.pop(site, 0)
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(
+            f"Event loop blocked for over {blocked_for * 1000:.0f}ms "
+            f"({suppressed} similar reports suppressed), loop thread stack:\n"
+            f"{stack}"
+        )
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        check_interval = min(self.interval, self.block_threshold) / 4
+        while not self._stop.wait(check_interval):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            # One report per stall, taken while the callback is still running
+            reported_heartbeat = heartbeat
+            event_loop_blocks.labels().inc()
+            self._report(blocked_for)
+
+    async def run(self) -> None:
+        """Measure loop lag and watch for blocking calls; runs until cancelled."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        watchdog.start()
+        lag = event_loop_lag_seconds.labels()
+        try:
+            while True:
+                start = time.monotonic()
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                lag.observe(max(0.0, now - start - self.interval))
+                self._heartbeat = now
+        finally:
+            self._stop.set()
+            watchdog.join()
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    block_threshold=settings.loop_block_threshold_ms / 1000,
+    log_interval=settings.loop_block_log_interval_seconds,
+)
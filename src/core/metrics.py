@@ -0,0 +1,309 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+
+# Upper bounds in seconds; spans sub-millisecond cache hits to slow bcrypt
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+OVERFLOW_LABEL_VALUE = "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric:
+    """
+    A named metric with a fixed set of label names.
+
+    Each distinct label combination is a series. The number of series is
+    capped at ``max_series``; further combinations are folded into one
+    series whose labels are all ``other``, so an unexpected label value can
+    never grow memory or scrape size without bound.
+    """
+
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        max_series: int = 200,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.max_series = max_series
+        self._children: dict[tuple[str, ...], object] = {}
+        registry.register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels: str):
+        """Return the series for a label combination, creating it if needed."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            if len(self._children) >= self.max_series:
+                key = (OVERFLOW_LABEL_VALUE,) * len(self.labelnames)
+                child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self._samples()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def labels(self, **labels: str) -> _CounterChild:
+        return super().labels(**labels)
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_total{labels} {child.value}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def labels(self, **labels: str) -> _GaugeChild:
+        return super().labels(**labels)
+
+    def _samples(self) -> Iterator[str]:
+        for key, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {child.value}"
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        max_series: int = 200,
+    ):
+        self.buckets = buckets
+        super().__init__(name, documentation, labelnames, max_series)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def labels(self, **labels: str) -> _HistogramChild:
+        return super().labels(**labels)
+
+    def _samples(self) -> Iterator[str]:
+        names = (*self.labelnames, "le")
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), child.counts):
+                cumulative += count
+                labels = _format_labels(names, (*key, str(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {child.sum}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# All label values below come from fixed sets: operation and method names
+# in code, route templates, status codes and exception class names.
+password_hash_seconds = Histogram(
+    "auth_password_hash_seconds",
+    "Time spent hashing or verifying passwords in a worker",
+    ("operation",),
+)
+password_hash_wait_seconds = Histogram(
+    "auth_password_hash_wait_seconds",
+    "Time password jobs waited for a free hashing worker",
+    ("operation",),
+)
+db_query_seconds = Histogram(
+    "auth_db_query_seconds",
+    "Database time per UserService method",
+    ("method",),
+)
+db_session_acquire_seconds = Histogram(
+    "auth_db_session_acquire_seconds",
+    "Time a session waited for a pooled connection on its first statement",
+)
+db_pool_checked_out = Gauge(
+    "auth_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+)
+db_pool_overflow_events = Counter(
+    "auth_db_pool_overflow_events",
+    "Checkouts that needed a connection beyond the pool size",
+)
+db_connection_hold_seconds = Histogram(
+    "auth_db_connection_hold_seconds",
+    "Time a database connection stayed checked out of the pool",
+)
+db_reads = Counter(
+    "auth_db_reads",
+    "Read-only user lookups by the database that served them",
+    ("target",),
+)
+db_replica_lag_seconds = Gauge(
+    "auth_db_replica_lag_seconds",
+    "Replay lag of each read replica at its last health check",
+    ("replica",),
+)
+jwt_seconds = Histogram(
+    "auth_jwt_seconds",
+    "Time spent signing or verifying JWTs",
+    ("operation",),
+)
+http_request_seconds = Histogram(
+    "auth_http_request_seconds",
+    "Total HTTP request time per route",
+    ("method", "route", "status"),
+)
+grpc_request_seconds = Histogram(
+    "auth_grpc_request_seconds",
+    "Total gRPC call time per method",
+    ("method", "code"),
+)
+event_loop_lag_seconds = Histogram(
+    "auth_event_loop_lag_seconds",
+    "How late the event loop ran a timer scheduled by the lag monitor",
+)
+event_loop_blocks = Counter(
+    "auth_event_loop_blocks",
+    "Times a single callback held the event loop past the block threshold",
+)
+auth_outcomes = Counter(
+    "auth_outcomes",
+    "Results of authentication operations by outcome",
+    ("operation", "outcome"),
+)
+
+
+def count_outcomes(operation: str):
+    """Count calls of an async function by success or exception class."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                auth_outcomes.labels(
+                    operation=operation, outcome=type(e).__name__
+                ).inc()
+                raise
+            auth_outcomes.labels(operation=operation, outcome="success").inc()
+            return result
+
+        return wrapper
+
+    return decorator
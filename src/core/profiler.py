@@ -0,0 +1,238 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import PurePath
+from types import CodeType, FrameType
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _label(code: CodeType) -> str:
+    path = PurePath(code.co_filename)
+    return f"{code.co_qualname} ({'/'.join(path.parts[-2:])}:{code.co_firstlineno})"
+
+
+@dataclass
+class Profile:
+    """Stack samples collected while one request or call was in flight."""
+
+    id: str
+    name: str
+    trigger: str
+    started_at: datetime
+    duration_seconds: float = 0.0
+    samples: int = 0
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    def folded(self) -> str:
+        """Render in the folded format read by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": self.duration_seconds,
+            "samples": self.samples,
+        }
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in memory."""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+
+    def add(self, profile: Profile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Profile | None:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[Profile]:
+        return list(reversed(self._profiles.values()))
+
+
+class _Sampler(threading.Thread):
+    """
+    Samples the event loop thread on behalf of one asyncio task.
+
+    When the task is running, its stack is read from the loop thread. When
+    it is suspended, its await chain is walked instead, so the profile also
+    shows where the request was waiting, for example on the hashing pool
+    or a database round trip. Other tasks' work is never attributed to it.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        task: asyncio.Task,
+        interval: float,
+        max_duration: float,
+    ):
+        super().__init__(name=f"profiler-{profile.id}", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self.max_duration = max_duration
+        self._loop_thread_id = threading.get_ident()
+        self._root = task.get_coro()
+        self._root_frame = self._root.cr_frame
+        self._stop = threading.Event()
+
+    def _running_stack(self, frame: FrameType | None) -> list[str] | None:
+        labels = []
+        while frame is not None:
+            labels.append(_label(frame.f_code))
+            if frame is self._root_frame:
+                labels.reverse()
+                return labels
+            frame = frame.f_back
+        return None
+
+    def _awaiting_stack(self) -> list[str]:
+        labels = ["[awaiting]"]
+        awaitable = self._root
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(
+                awaitable, "ag_frame", None
+            )
+            if frame is None:
+                labels.append(f"<{type(awaitable).__name__}>")
+                break
+            labels.append(_label(frame.f_code))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(
+                awaitable, "ag_await", None
+            )
+        return labels
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = self._running_stack(frame) or self._awaiting_stack()
+        self.profile.stacks[";".join(stack)] += 1
+        self.profile.samples += 1
+
+    def run(self) -> None:
+        deadline = time.monotonic() + self.max_duration
+        while not self._stop.wait(self.interval):
+            if time.monotonic() > deadline or self._root.cr_frame is None:
+                break
+            self._sample()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.join(timeout=self.interval * 2)
+
+
+class RequestProfiler:
+    """
+    Attaches a sampling profiler to individual requests on demand.
+
+    A request is profiled when it carries a valid signed trigger token, or
+    when it is picked by 1-in-N random sampling. Only a few profiles run at
+    once, and requests that aren't profiled pay one dict lookup.
+    """
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        secret: str | None,
+        sample_one_in: int | None,
+        interval: float,
+        max_concurrent: int,
+        max_duration: float,
+        rand: Callable[[], float] = random.random,
+    ):
+        self.store = store
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self.max_duration = max_duration
+        self._secret = secret.encode() if secret else None
+        self._sample_one_in = sample_one_in
+        self._rand = rand
+        self._active = 0
+
+    def _signature(self, expires_at: int) -> str:
+        return hmac.new(
+            self._secret, str(expires_at).encode(), hashlib.sha256
+        ).hexdigest()
+
+    def create_token(self, ttl_seconds: int) -> str:
+        """Create a trigger token valid for ttl_seconds."""
+        if self._secret is None:
+            raise ValueError("PROFILER_SECRET is not configured")
+        expires_at = int(time.time()) + ttl_seconds
+        return f"{expires_at}.{self._signature(expires_at)}"
+
+    def _valid_token(self, token: str) -> bool:
+        if self._secret is None:
+            return False
+        expires_at, _, signature = token.partition(".")
+        if not expires_at.isdigit() or int(expires_at) < time.time():
+            return False
+        return hmac.compare_digest(signature, self._signature(int(expires_at)))
+
+    def trigger(self, token: str | None) -> str | None:
+        """Return why a request should be profiled, or None to skip it."""
+        if token and self._valid_token(token):
+            return "token"
+        if self._sample_one_in and self._rand() * self._sample_one_in < 1:
+            return "sampled"
+        return None
+
+    @contextmanager
+    def profile(self, name: str, trigger: str) -> Iterator[Profile | None]:
+        """Sample the current task for the duration of the block."""
+        task = asyncio.current_task()
+        if task is None or self._active >= self.max_concurrent:
+            yield None
+            return
+
+        profile = Profile(
+            id=uuid.uuid4().hex,
+            name=name,
+            trigger=trigger,
+            started_at=datetime.now(UTC),
+        )
+        sampler = _Sampler(profile, task, self.interval, self.max_duration)
+        self._active += 1
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield profile
+        finally:
+            sampler.stop()
+            self._active -= 1
+            profile.duration_seconds = time.perf_counter() - start
+            self.store.add(profile)
+            logger.info(
+                f"Profiled {name} ({trigger}): {profile.samples} samples "
+                f"in {profile.duration_seconds:.3f}s, id {profile.id}"
+            )
+
+
+profiler = RequestProfiler(
+    store=ProfileStore(max_profiles=settings.profiler_max_profiles),
+    secret=settings.profiler_secret,
+    sample_one_in=settings.profiler_sample_one_in,
+    interval=settings.profiler_interval_ms / 1000,
+    max_concurrent=settings.profiler_max_concurrent,
+    max_duration=settings.profiler_max_duration_seconds,
+)
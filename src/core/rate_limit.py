@@ -0,0 +1,221 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from core.config import settings
+from core.exceptions import RateLimitExceededError
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Allow ``limit`` hits per sliding window of ``window_seconds``."""
+
+    limit: int
+    window_seconds: float
+
+
+def _sliding_count(
+    previous: int,
+    current: int,
+    elapsed: float,
+    window_seconds: float,
+) -> float:
+    """
+    Estimate hits in the sliding window ending now.
+
+    Uses the sliding window counter approximation: the previous fixed
+    window's count is weighted by how much of it the sliding window still
+    overlaps.
+    """
+    return previous * (1 - elapsed / window_seconds) + current
+
+
+class RateLimitBackend(ABC):
+    """Storage for rate limit counters."""
+
+    @abstractmethod
+    async def hit(self, key: str, rate: RateLimit) -> float | None:
+        """
+        Record a hit for key if it is within the rate.
+
+        Returns:
+            None if the hit is allowed, otherwise seconds until retrying
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process sliding window counters.
+
+    Each key keeps two fixed-window counters, so updates are O(1). The
+    number of tracked keys is bounded; the least recently seen keys are
+    evicted first, which at worst forgets a few hits of an idle client.
+    """
+
+    def __init__(
+        self,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._clock = clock
+        # key -> [window index, previous window count, current window count]
+        self._windows: OrderedDict[str, list[int]] = OrderedDict()
+
+    async def hit(self, key: str, rate: RateLimit) -> float | None:
+        now = self._clock()
+        window = int(now // rate.window_seconds)
+        elapsed = now - window * rate.window_seconds
+
+        state = self._windows.get(key)
+        if state is None:
+            state = [window, 0, 0]
+            self._windows[key] = state
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._windows.move_to_end(key)
+            if state[0] != window:
+                previous = state[2] if state[0] == window - 1 else 0
+                state[:] = [window, previous, 0]
+
+        count = _sliding_count(state[1], state[2], elapsed, rate.window_seconds)
+        if count >= rate.limit:
+            return rate.window_seconds - elapsed
+
+        state[2] += 1
+        return None
+
+
+class CounterStore(Protocol):
+    """
+    Minimal async counter store interface.
+
+    ``redis.asyncio.Redis`` satisfies it, as does LocalCounterStore.
+    """
+
+    async def incr(self, key: str) -> int: ...
+
+    async def decr(self, key: str) -> int: ...
+
+    async def expire(self, key: str, seconds: int) -> bool: ...
+
+    async def get(self, key: str) -> bytes | str | int | None: ...
+
+
+class CounterStoreRateLimitBackend(RateLimitBackend):
+    """
+    Sliding window counters kept in a shared counter store.
+
+    Lets several service instances enforce one limit together. Each fixed
+    window is a separate key that expires after two windows.
+    """
+
+    def __init__(
+        self,
+        store: CounterStore,
+        prefix: str = "ratelimit:",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store
+        self.prefix = prefix
+        self._clock = clock
+
+    async def hit(self, key: str, rate: RateLimit) -> float | None:
+        now = self._clock()
+        window = int(now // rate.window_seconds)
+        elapsed = now - window * rate.window_seconds
+        current_key = f"{self.prefix}{key}:{window}"
+
+        current = await self.store.incr(current_key)
+        if current == 1:
+            await self.store.expire(current_key, math.ceil(2 * rate.window_seconds))
+        previous = int(await self.store.get(f"{self.prefix}{key}:{window - 1}") or 0)
+
+        # current already includes this hit
+        count = _sliding_count(previous, current - 1, elapsed, rate.window_seconds)
+        if count >= rate.limit:
+            await self.store.decr(current_key)
+            return rate.window_seconds - elapsed
+        return None
+
+
+class LocalCounterStore:
+    """In-process stand-in for a shared counter store, for tests and dev."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._values: dict[str, int] = {}
+        self._expires_at: dict[str, float] = {}
+
+    def _purge(self, key: str) -> None:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= self._clock():
+            self._values.pop(key, None)
+            self._expires_at.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._purge(key)
+        self._values[key] = self._values.get(key, 0) + 1
+        return self._values[key]
+
+    async def decr(self, key: str) -> int:
+        self._purge(key)
+        self._values[key] = self._values.get(key, 0) - 1
+        return self._values[key]
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if key not in self._values:
+            return False
+        self._expires_at[key] = self._clock() + seconds
+        return True
+
+    async def get(self, key: str) -> int | None:
+        self._purge(key)
+        return self._values.get(key)
+
+
+class RateLimiter:
+    """Applies named rate limits to identities through a pluggable backend."""
+
+    def __init__(self, backend: RateLimitBackend, rates: dict[str, RateLimit]):
+        self.backend = backend
+        self.rates = rates
+
+    async def check(self, scope: str, identity: str) -> None:
+        """
+        Count a request by identity against the rate for scope.
+
+        Raises:
+            RateLimitExceededError: If the identity is over the limit
+        """
+        key = f"{scope}:{identity}"
+        retry_after = await self.backend.hit(key, self.rates[scope])
+        if retry_after is not None:
+            raise RateLimitExceededError(scope, max(1, math.ceil(retry_after)))
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email so case and whitespace variants share a limit."""
+    return email.strip().lower()
+
+
+credential_rate_limiter = RateLimiter(
+    backend=InMemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys),
+    rates={
+        "ip": RateLimit(
+            limit=settings.rate_limit_ip_requests,
+            window_seconds=settings.rate_limit_ip_window_seconds,
+        ),
+        "email": RateLimit(
+            limit=settings.rate_limit_email_requests,
+            window_seconds=settings.rate_limit_email_window_seconds,
+        ),
+    },
+)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, model_validator
 
 
 class UserBase(BaseModel):
@@ -24,6 +24,25 @@ class UserCreate(UserBase):
     password: str
 
 
+class UserImportRow(UserBase):
+    """Schema for one row of a bulk user import."""
+
+    password: str | None = None
+    hashed_password: str | None = None
+
+    @model_validator(mode="after")
+    def validate_credentials(self) -> "UserImportRow":
+        """Require exactly one of a plain password or an existing bcrypt hash."""
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError("Provide exactly one of password or hashed_password")
+        if self.hashed_password is not None and not (
+            len(self.hashed_password) == 60
+            and self.hashed_password[:4] in ("$2a$", "$2b$", "$2y$")
+        ):
+            raise ValueError("hashed_password must be a bcrypt hash")
+        return self
+
+
 class UserResponse(UserBase):
     """Schema for user response."""
 
@@ -0,0 +1,359 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import secrets
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    """The trace position carried by a W3C traceparent header."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """Parse a version 00 traceparent header, ignoring malformed ones."""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_seconds(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def set_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error}
+            if self.error
+            else {"code": "OK"},
+        }
+
+
+class TailSampler:
+    """
+    Decides whether to keep a trace once its root span has finished.
+
+    Deciding at the end lets the policy keep a fixed share of failed and of
+    slow requests, which a decision made up front cannot see, while only a
+    small share of ordinary traffic is exported. Traces the caller already
+    sampled are kept so distributed traces stay complete.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        slow_threshold_seconds: float,
+        slow_sample_rate: float,
+        error_sample_rate: float,
+        rand: Callable[[], float] = random.random,
+    ):
+        self.sample_rate = sample_rate
+        self.slow_threshold_seconds = slow_threshold_seconds
+        self.slow_sample_rate = slow_sample_rate
+        self.error_sample_rate = error_sample_rate
+        self._rand = rand
+
+    def keep(self, root: Span, parent_sampled: bool) -> bool:
+        # Checked first: dropping a failed or slow span of a sampled trace
+        # would leave a hole in it
+        if parent_sampled:
+            return True
+        if root.error is not None:
+            return self._rand() < self.error_sample_rate
+        if root.duration_seconds >= self.slow_threshold_seconds:
+            return self._rand() < self.slow_sample_rate
+        return self._rand() < self.sample_rate
+
+
+class SpanExporter(ABC):
+    """
+    Buffers finished traces and ships them in batches from a background task.
+
+    The buffer is bounded; when the exporter falls behind the oldest spans
+    are dropped rather than growing memory or slowing requests.
+    """
+
+    def __init__(self, interval: float, max_buffered: int = 10_000):
+        self.interval = interval
+        self.dropped = 0
+        self._buffer: deque[Span] = deque(maxlen=max_buffered)
+
+    def export(self, spans: list[Span]) -> None:
+        """Queue spans for export; never blocks."""
+        overflow = len(self._buffer) + len(spans) - self._buffer.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._buffer.extend(spans)
+
+    @abstractmethod
+    async def _send(self, batch: list[dict]) -> None:
+        """Deliver a batch of serialized spans."""
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch = [span.to_dict() for span in self._buffer]
+        self._buffer.clear()
+        try:
+            await self._send(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.error(f"Failed to export {len(batch)} spans: {str(e)}")
+
+    async def run(self) -> None:
+        """Export buffered spans periodically; runs until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                await self.flush()
+        finally:
+            await self.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans to a local file as newline-delimited JSON."""
+
+    def __init__(self, path: Path, interval: float):
+        super().__init__(interval)
+        self.path = path
+
+    def _write(self, batch: list[dict]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(span) + "\n" for span in batch)
+
+    async def _send(self, batch: list[dict]) -> None:
+        await asyncio.to_thread(self._write, batch)
+
+
+class HttpSpanExporter(SpanExporter):
+    """Posts span batches as JSON to a collector endpoint."""
+
+    def __init__(self, endpoint: str, interval: float):
+        super().__init__(interval)
+        self.endpoint = endpoint
+        self._client = httpx.AsyncClient(timeout=5)
+
+    async def _send(self, batch: list[dict]) -> None:
+        response = await self._client.post(self.endpoint, json={"spans": batch})
+        response.raise_for_status()
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_trace_spans: ContextVar[list[Span] | None] = ContextVar("trace_spans", default=None)
+
+
+class Tracer:
+    """
+    Records spans for requests and hands sampled traces to an exporter.
+
+    A trace starts at a request entry point and collects every span opened
+    while handling it, through context variables. Outside a trace, opening
+    a span costs a context variable lookup and records nothing.
+    """
+
+    def __init__(
+        self,
+        sampler: TailSampler,
+        exporter: SpanExporter | None,
+        max_spans_per_trace: int,
+    ):
+        self.sampler = sampler
+        self.exporter = exporter
+        self.max_spans_per_trace = max_spans_per_trace
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        traceparent: str | None = None,
+        **attributes,
+    ) -> Iterator[Span | None]:
+        """
+        Open the root span of a request, continuing an incoming trace.
+
+        The root is not marked as failed when the block raises: only the
+        entry point knows whether an exception is a client error, such as a
+        rejected token, or a server failure that the sampler should favour.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = parse_traceparent(traceparent)
+        root = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+        spans = [root]
+        span_token = _current_span.set(root)
+        spans_token = _trace_spans.set(spans)
+        try:
+            yield root
+        finally:
+            root.end_ns = time.time_ns()
+            _current_span.reset(span_token)
+            _trace_spans.reset(spans_token)
+            if self.sampler.keep(root, parent is not None and parent.sampled):
+                self.exporter.export(spans)
+
+    def _new_span(self, name: str, attributes: dict) -> Span | None:
+        parent = _current_span.get()
+        spans = _trace_spans.get()
+        if parent is None or spans is None:
+            return None
+        if len(spans) >= self.max_spans_per_trace:
+            return None
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id,
+            attributes=attributes,
+        )
+        spans.append(span)
+        return span
+
+    def open_span(self, name: str, **attributes) -> tuple[Span, Token] | None:
+        """
+        Open a child span of the current span, if a trace is active.
+
+        For callbacks that can't wrap the operation in ``span()``; the
+        handle must be passed to close_span() in the same context.
+        """
+        span = self._new_span(name, attributes)
+        if span is None:
+            return None
+        return span, _current_span.set(span)
+
+    def close_span(
+        self,
+        handle: tuple[Span, Token],
+        error: BaseException | None = None,
+    ) -> None:
+        span, token = handle
+        if error is not None:
+            span.set_error(error)
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span | None]:
+        """Run the block in a child span of the current span, if any."""
+        handle = self.open_span(name, **attributes)
+        if handle is None:
+            yield None
+            return
+
+        try:
+            yield handle[0]
+        except BaseException as e:
+            self.close_span(handle, e)
+            raise
+        self.close_span(handle)
+
+    def record_span(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        **attributes,
+    ) -> None:
+        """Record an already finished operation as a child of the current span."""
+        span = self._new_span(name, attributes)
+        if span is not None:
+            span.start_ns = start_ns
+            span.end_ns = end_ns
+
+    def traced(self, name: str):
+        """Run every call of an async function in a span."""
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+def build_exporter() -> SpanExporter | None:
+    """Build the span exporter selected by TRACING_EXPORTER, if any."""
+    interval = settings.tracing_export_interval_seconds
+    if settings.tracing_exporter == "file":
+        return FileSpanExporter(Path(settings.tracing_file_path), interval)
+    if settings.tracing_exporter == "http":
+        return HttpSpanExporter(settings.tracing_endpoint, interval)
+    return None
+
+
+tracer = Tracer(
+    sampler=TailSampler(
+        sample_rate=settings.tracing_sample_rate,
+        slow_threshold_seconds=settings.tracing_slow_threshold_ms / 1000,
+        slow_sample_rate=settings.tracing_slow_sample_rate,
+        error_sample_rate=settings.tracing_error_sample_rate,
+    ),
+    exporter=build_exporter(),
+    max_spans_per_trace=settings.tracing_max_spans_per_trace,
+)
@@ -6,6 +6,6 @@ from db.db_helper import db_session_manager
 def provide_session(func):
     @wraps(func)
     async def wrapper(self, request, context):
-        async with db_session_manager.sessionmaker() as session:
+        async with db_session_manager.lazy_session() as session:
             return await func(self, request, context, session=session)
     return wrapper
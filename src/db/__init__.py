@@ -1 +1 @@
-from .db_helper import db_session_manager, AsyncSessionManager
+from .db_helper import db_session_manager, AsyncSessionManager, LazySession
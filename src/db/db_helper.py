@@ -1,5 +1,239 @@
-from shared.db.session import AsyncSessionManager
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
 
 from core.config import settings
+from core.metrics import (
+    db_connection_hold_seconds,
+    db_pool_checked_out,
+    db_pool_overflow_events,
+    db_session_acquire_seconds,
+)
+from core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class LazySession:
+    """
+    Session handle that opens an AsyncSession only when first used.
+
+    It stands in wherever an AsyncSession is expected. Requests that fail
+    before touching the database, or that are answered from a cache, never
+    create a session or check out a connection. ``release()`` gives the
+    connection back as soon as the caller is done with the database, for
+    example before a slow password verify; if the handle is used again
+    afterwards, a fresh session is opened.
+    """
+
+    __slots__ = ("_sessionmaker", "_session")
+
+    def __init__(self, sessionmaker: Callable[[], AsyncSession]):
+        self._sessionmaker = sessionmaker
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """The underlying session, opened on first access."""
+        if self._session is None:
+            self._session = self._sessionmaker()
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def release(self) -> None:
+        """
+        Close the underlying session, returning its connection to the pool.
+
+        An open transaction is rolled back, so commit writes first. Objects
+        already loaded stay readable but are detached.
+        """
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    async def __aenter__(self) -> "LazySession":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release()
+
+
+class AsyncSessionManager:
+    """
+    Owns the async engine and its connection pool, and hands out sessions.
+
+    Behind a transaction-mode pooler consecutive transactions may run on
+    different server connections, so a statement prepared on one is missing
+    on the next. With ``transaction_pooler`` set, asyncpg and SQLAlchemy
+    cache no prepared statements and each statement gets a unique name.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_pre_ping: bool = False,
+        pool_recycle: int = -1,
+        statement_cache_size: int | None = None,
+        transaction_pooler: bool = False,
+    ):
+        connect_args = {}
+        if make_url(database_url).get_driver_name() == "asyncpg":
+            if transaction_pooler:
+                connect_args["statement_cache_size"] = 0
+                connect_args["prepared_statement_cache_size"] = 0
+                connect_args["prepared_statement_name_func"] = (
+                    lambda: f"__asyncpg_{uuid.uuid4()}__"
+                )
+            elif statement_cache_size is not None:
+                connect_args["prepared_statement_cache_size"] = statement_cache_size
+
+        self.engine = create_async_engine(
+            database_url,
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+            connect_args=connect_args,
+        )
+        self.sessionmaker = async_sessionmaker(self.engine)
+
+    def lazy_session(self) -> LazySession:
+        """Create a session handle that connects on first use."""
+        return LazySession(self.sessionmaker)
+
+    async def get_lazy_session(self) -> AsyncIterator[LazySession]:
+        """FastAPI dependency yielding a lazy session released afterwards."""
+        async with self.lazy_session() as session:
+            yield session
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        await self.engine.dispose()
+
+
+def create_session_manager(database_url: str) -> AsyncSessionManager:
+    """Create a session manager with the pool options from settings."""
+    return AsyncSessionManager(
+        database_url=database_url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        statement_cache_size=settings.db_statement_cache_size,
+        transaction_pooler=settings.db_transaction_pooler,
+    )
+
+
+db_session_manager = create_session_manager(settings.database_url)
+
+_STATEMENT_STARTED_KEY = "statement_started"
+_acquire_seconds = db_session_acquire_seconds.labels()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_start(orm_execute_state: ORMExecuteState) -> None:
+    # Runs before the session checks out a connection for the statement
+    orm_execute_state.session.info[_STATEMENT_STARTED_KEY] = (
+        time.perf_counter(),
+        time.time_ns(),
+    )
+
+
+@event.listens_for(Session, "after_begin")
+def _observe_connection_acquired(session: Session, transaction, connection) -> None:
+    started = session.info.pop(_STATEMENT_STARTED_KEY, None)
+    if started is not None:
+        started_perf, started_ns = started
+        _acquire_seconds.observe(time.perf_counter() - started_perf)
+        tracer.record_span("db.acquire_connection", started_ns, time.time_ns())
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_statement_start(session: Session, transaction: SessionTransaction) -> None:
+    # A begin triggered by a flush has no statement start to measure from
+    session.info.pop(_STATEMENT_STARTED_KEY, None)
+
+
+_STATEMENT_SPAN_KEY = "trace_span"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _open_statement_span(conn, cursor, statement, parameters, context, executemany):
+    handle = tracer.open_span("db.execute", statement=statement[:200])
+    if handle is not None:
+        conn.info[_STATEMENT_SPAN_KEY] = handle
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _close_statement_span(conn, cursor, statement, parameters, context, executemany):
+    handle = conn.info.pop(_STATEMENT_SPAN_KEY, None)
+    if handle is not None:
+        tracer.close_span(handle)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(exception_context) -> None:
+    conn = exception_context.connection
+    handle = conn.info.pop(_STATEMENT_SPAN_KEY, None) if conn else None
+    if handle is not None:
+        tracer.close_span(handle, exception_context.original_exception)
+
+
+_CHECKED_OUT_AT_KEY = "checked_out_at"
+_FIRST_STATEMENT_KEY = "first_statement"
+_checked_out = db_pool_checked_out.labels()
+_overflow_events = db_pool_overflow_events.labels()
+_hold_seconds = db_connection_hold_seconds.labels()
+
+
+@event.listens_for(db_session_manager.engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    pool = db_session_manager.engine.pool
+    _checked_out.inc()
+    if pool.checkedout() > pool.size():
+        _overflow_events.inc()
+    connection_record.info[_CHECKED_OUT_AT_KEY] = time.perf_counter()
+
+
+@event.listens_for(db_session_manager.engine.sync_engine, "before_cursor_execute")
+def _remember_first_statement(
+    conn, cursor, statement, parameters, context, executemany
+):
+    # Names the code holding the connection if the hold turns out too long
+    conn.info.setdefault(_FIRST_STATEMENT_KEY, statement[:200])
+
 
-db_session_manager = AsyncSessionManager(database_url=settings.database_url, echo=True)
+@event.listens_for(db_session_manager.engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    # The hold is only known once the connection comes back, so a leaked
+    # connection never logs; it shows as auth_db_pool_checked_out not
+    # returning to its baseline
+    checked_out_at = connection_record.info.pop(_CHECKED_OUT_AT_KEY, None)
+    first_statement = connection_record.info.pop(_FIRST_STATEMENT_KEY, None)
+    if checked_out_at is None:
+        return
+    _checked_out.dec()
+    held = time.perf_counter() - checked_out_at
+    _hold_seconds.observe(held)
+    if held > settings.db_connection_hold_warning_seconds:
+        logger.warning(
+            f"Database connection held for {held:.2f}s "
+            f"(warning at {settings.db_connection_hold_warning_seconds}s), "
+            f"first statement: {first_statement}"
+        )
@@ -1,7 +1,11 @@
 from .base import Base
+from .refresh_session import RefreshSession
+from .revoked_session import RevokedSession
 from .user import User
 
 __all__ = [
     "Base",
+    "RefreshSession",
+    "RevokedSession",
     "User",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import func
+from sqlalchemy import Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -8,7 +8,7 @@ from .base import Base
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[str] = mapped_column(nullable=False)
     last_name: Mapped[str] = mapped_column(nullable=False)
     username: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
@@ -22,6 +22,7 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(
         server_default=func.now(),
         nullable=False,
+        index=True,
     )
     updated_at: Mapped[datetime] = mapped_column(
         server_default=func.now(),
@@ -29,3 +30,14 @@ class User(Base):
         nullable=False,
     )
 
+    __table_args__ = (
+        # Case-insensitive login lookups, covering every column a login
+        # reads so they are answered from the index alone
+        Index(
+            "ix_users_email_lower",
+            func.lower(email),
+            unique=True,
+            postgresql_include=["id", "email", "hashed_password", "is_active"],
+        ),
+    )
+
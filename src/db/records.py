@@ -0,0 +1,48 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+from sqlalchemy import Row
+
+from db.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Immutable, session-independent view of a user row."""
+
+    id: int
+    first_name: str
+    last_name: str
+    username: str
+    email: str
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_row(cls, row: Row) -> "UserSnapshot":
+        """Build a snapshot from a row selected with USER_SNAPSHOT_COLUMNS."""
+        return cls(*row)
+
+
+@dataclass(frozen=True, slots=True)
+class LoginRecord:
+    """The columns a password login reads, without loading the whole user."""
+
+    id: int
+    email: str
+    hashed_password: str
+    is_active: bool
+
+    @classmethod
+    def from_row(cls, row: Row) -> "LoginRecord":
+        """Build a record from a row selected with LOGIN_RECORD_COLUMNS."""
+        return cls(*row)
+
+
+# Column projections in field order, so rows map onto records positionally
+# without going through the ORM identity map
+USER_SNAPSHOT_COLUMNS = tuple(getattr(User, f.name) for f in fields(UserSnapshot))
+LOGIN_RECORD_COLUMNS = tuple(getattr(User, f.name) for f in fields(LoginRecord))
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import db_reads, db_replica_lag_seconds
+from db.db_helper import AsyncSessionManager, LazySession, create_session_manager
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# NULL unless the replica is streaming from the primary: a replica cut off
+# from it has replayed all it received and would otherwise report zero lag.
+# Zero when streaming and caught up, so an idle primary doesn't make the
+# replica look stale. Reading the receiver status needs pg_read_all_stats
+# (or pg_monitor); without it every replica stays out of rotation.
+_REPLAY_LAG = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'"
+    ") THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class _Replica:
+    __slots__ = ("name", "manager", "healthy", "lag")
+
+    def __init__(self, name: str, manager: AsyncSessionManager):
+        self.name = name
+        self.manager = manager
+        self.healthy = False
+        self.lag = db_replica_lag_seconds.labels(replica=name)
+
+
+class ReplicaSet:
+    """
+    Read replicas serving read-only lookups with bounded staleness.
+
+    A background check measures each replica's replay lag. Replicas that
+    fail the check, are not streaming from the primary or lag more than
+    ``max_lag`` leave the rotation until they recover, and reads are spread
+    round robin over the rest. A user who wrote recently reads from the
+    primary until every replica in rotation is sure to have the write, so
+    a token issued right after registration never misses its own user.
+
+    Recent writes are tracked in process memory only. A write made through
+    another instance is not known here, so a request routed to a different
+    instance right after a write may read a replica up to ``max_lag``
+    behind.
+    """
+
+    def __init__(
+        self,
+        managers: list[AsyncSessionManager],
+        max_lag: float,
+        check_interval: float,
+        max_recent_writers: int,
+    ):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._replicas = [
+            _Replica(str(i), manager) for i, manager in enumerate(managers)
+        ]
+        # A write is visible on every replica in rotation once this passes
+        self._recent_writers: TTLCache[int, bool] = TTLCache(
+            max_size=max_recent_writers,
+            default_ttl=max_lag + check_interval,
+        )
+        self._next = 0
+
+    def note_write(self, user_id: int) -> None:
+        """
+        Send the user's reads to the primary until replicas catch up.
+
+        Only reads on this instance are affected; other instances don't
+        learn about the write.
+        """
+        self._recent_writers.set(user_id, True)
+
+    def _choose(self, user_ids: Iterable[int]) -> _Replica | None:
+        if any(user_id in self._recent_writers for user_id in user_ids):
+            return None
+        healthy = [replica for replica in self._replicas if replica.healthy]
+        if not healthy:
+            return None
+        self._next = (self._next + 1) % len(healthy)
+        return healthy[self._next]
+
+    async def read(
+        self,
+        user_ids: Iterable[int],
+        primary: LazySession,
+        query: Callable[[LazySession], Awaitable[T]],
+    ) -> T:
+        """
+        Run a read-only query on a replica, or on the primary when needed.
+
+        Args:
+            user_ids: Users the query reads, to honour their recent writes
+            primary: Session on the primary, used when no replica may serve
+            query: Read-only query taking the session to run on
+
+        Returns:
+            The query's result
+        """
+        replica = self._choose(user_ids)
+        if replica is None:
+            db_reads.labels(target="primary").inc()
+            return await query(primary)
+
+        try:
+            async with replica.manager.lazy_session() as session:
+                result = await query(session)
+        except (SQLAlchemyError, OSError) as e:
+            replica.healthy = False
+            logger.warning(
+                f"Read from replica {replica.name} failed, using the primary: "
+                f"{str(e)}"
+            )
+            db_reads.labels(target="fallback").inc()
+            return await query(primary)
+
+        db_reads.labels(target="replica").inc()
+        return result
+
+    async def _check(self, replica: _Replica) -> None:
+        try:
+            async with asyncio.timeout(self.check_interval):
+                async with replica.manager.sessionmaker() as session:
+                    lag = await session.scalar(_REPLAY_LAG)
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"Replica {replica.name} failed its check: {str(e)}")
+            replica.healthy = False
+            return
+
+        if lag is None:
+            if replica.healthy:
+                logger.warning(
+                    f"Replica {replica.name} is not streaming from the primary"
+                )
+            replica.healthy = False
+            return
+
+        lag = float(lag)
+        replica.lag.set(lag)
+        healthy = lag <= self.max_lag
+        if healthy != replica.healthy:
+            state = "back in rotation" if healthy else "out of rotation"
+            logger.info(f"Replica {replica.name} {state}, replay lag {lag:.1f}s")
+        replica.healthy = healthy
+
+    async def run(self) -> None:
+        """Check replica health periodically; runs until cancelled."""
+        while True:
+            await asyncio.gather(*(self._check(r) for r in self._replicas))
+            await asyncio.sleep(self.check_interval)
+
+    async def close(self) -> None:
+        """Close all replica connections."""
+        for replica in self._replicas:
+            await replica.manager.close()
+
+
+replica_set = (
+    ReplicaSet(
+        managers=[
+            create_session_manager(url) for url in settings.database_replica_urls
+        ],
+        max_lag=settings.replica_max_lag_seconds,
+        check_interval=settings.replica_health_check_interval_seconds,
+        max_recent_writers=settings.replica_recent_writers_max_size,
+    )
+    if settings.database_replica_urls
+    else None
+)
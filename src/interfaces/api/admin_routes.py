@@ -0,0 +1,37 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from core.dependencies import get_current_superuser
+from core.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(get_current_superuser)])
+
+
+@router.get("/profiles")
+async def list_profiles():
+    return [profile.summary() for profile in profiler.store.list()]
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    profile = profiler.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(
+        content=profile.folded(),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="{profile.id}.folded"'
+        },
+    )
+
+
+@router.post("/profiles/token")
+async def create_profile_token(ttl_seconds: int = Query(default=300, ge=1, le=3600)):
+    try:
+        token = profiler.create_token(ttl_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"token": token, "header": "X-Profile", "expires_in": ttl_seconds}
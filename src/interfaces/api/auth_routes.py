@@ -1,8 +1,7 @@
 import logging
-from fastapi import APIRouter, Body, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 
-from core.dependencies import get_auth_service
+from core.dependencies import get_auth_service, rate_limit_by_ip
 from core.schemas.user import (
     UserCreate,
     UserLogin,
@@ -13,24 +12,32 @@ from core.exceptions import (
     UserAlreadyExistsError,
     InvalidCredentialsError,
     InvalidTokenError,
+    RateLimitExceededError,
+    ServiceOverloadedError,
     TokenExpiredError,
     UserNotFoundError,
 )
+from core.rate_limit import credential_rate_limiter, normalize_email
 from services.auth_service import AuthService
-from db import db_session_manager
+from db import db_session_manager, LazySession
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit_by_ip)],
+)
 async def login(
     user_data: UserLogin,
     auth_service: AuthService = Depends(get_auth_service),
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    session: LazySession = Depends(db_session_manager.get_lazy_session),
 ):
     try:
+        await credential_rate_limiter.check("email", normalize_email(user_data.email))
         return await auth_service.authenticate_user(
             user_data.email,
             user_data.password,
@@ -39,27 +46,49 @@ async def login(
     except InvalidCredentialsError as e:
         logger.warning(f"Login failed for {user_data.email}: {str(e)}")
         raise HTTPException(status_code=401, detail=str(e))
+    except RateLimitExceededError as e:
+        logger.warning(f"Login rate limited for {user_data.email}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except ServiceOverloadedError as e:
+        logger.warning(f"Login shed under load for {user_data.email}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
 
-@router.post("/register", response_model=UserResponse)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    dependencies=[Depends(rate_limit_by_ip)],
+)
 async def register(
     user_data: UserCreate,
     auth_service: AuthService = Depends(get_auth_service),
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    session: LazySession = Depends(db_session_manager.get_lazy_session),
 ):
     try:
         user = await auth_service.register_user(user_data, session)
-        return UserResponse(**user.__dict__)
+        return UserResponse.model_validate(user)
     except UserAlreadyExistsError as e:
         logger.warning(f"Registration failed: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/refresh", response_model=TokenResponse)
+@router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit_by_ip)],
+)
 async def refresh_token(
     refresh_token: str = Body(..., embed=True),
     auth_service: AuthService = Depends(get_auth_service),
-    session: AsyncSession = Depends(db_session_manager.get_async_session),
+    session: LazySession = Depends(db_session_manager.get_lazy_session),
 ):
     try:
         return await auth_service.refresh_access_token(refresh_token, session)
@@ -67,3 +96,20 @@ async def refresh_token(
         logger.warning(f"Token refresh failed: {str(e)}")
         raise HTTPException(status_code=401, detail=str(e))
 
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit_by_ip)],
+)
+async def logout(
+    refresh_token: str = Body(..., embed=True),
+    auth_service: AuthService = Depends(get_auth_service),
+    session: LazySession = Depends(db_session_manager.get_lazy_session),
+):
+    try:
+        await auth_service.logout(refresh_token, session)
+    except (InvalidTokenError, TokenExpiredError) as e:
+        logger.warning(f"Logout failed: {str(e)}")
+        raise HTTPException(status_code=401, detail=str(e))
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Request, Response
+
+from core.config import settings
+from core.dependencies import get_token_service
+from services.token_service import TokenService
+
+router = APIRouter()
+
+
+@router.get("/.well-known/jwks.json")
+async def get_jwks(
+    request: Request,
+    token_service: TokenService = Depends(get_token_service),
+):
+    body, etag = token_service.get_jwks_document()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.jwks_cache_max_age_seconds}",
+        "ETag": etag,
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,122 @@
+import time
+
+from core.metrics import http_request_seconds
+from core.profiler import profiler
+from core.tracing import tracer
+
+_KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Requests are labeled with the route template (``/users/me``), never the
+    raw path, so path parameters and probes for unknown URLs can't create
+    new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"] if scope["method"] in _KNOWN_METHODS else "other"
+            http_request_seconds.labels(
+                method=method, route=route, status=str(status)
+            ).observe(time.perf_counter() - start)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a trace for every HTTP request.
+
+    Continues the caller's trace when a W3C ``traceparent`` header is sent.
+    Responses with a 5xx status count as errors for sampling.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.start_trace(
+            f"HTTP {scope['method']}", traceparent, **{"http.method": scope["method"]}
+        ) as root:
+            try:
+                await self.app(scope, receive, send_with_status)
+            except Exception as e:
+                root.set_error(e)
+                raise
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                root.name = f"HTTP {scope['method']} {route}"
+                root.attributes["http.route"] = route
+                root.attributes["http.status_code"] = status
+                if status >= 500 and root.error is None:
+                    root.error = f"HTTP {status}"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware attaching the sampling profiler to selected requests.
+
+    A request is profiled when its ``X-Profile`` header holds a valid
+    trigger token, or when random sampling picks it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                token = value.decode("latin-1")
+                break
+
+        trigger = profiler.trigger(token)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        with profiler.profile(f"HTTP {scope['method']} {scope['path']}", trigger):
+            await self.app(scope, receive, send)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 
 from core.dependencies import get_current_active_user
 from core.schemas.user import UserResponse
-from db.models import User
+from db.records import UserSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +12,6 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
 ):
-    return UserResponse(**current_user.__dict__)
+    return UserResponse.model_validate(current_user)
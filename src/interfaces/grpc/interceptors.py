@@ -0,0 +1,149 @@
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import grpc
+
+from core.metrics import grpc_request_seconds
+from core.profiler import profiler
+from core.tracing import tracer
+
+# Codes that mean the server failed, as opposed to rejecting the request
+_SERVER_ERROR_CODES = frozenset(
+    {
+        grpc.StatusCode.UNKNOWN.name,
+        grpc.StatusCode.INTERNAL.name,
+        grpc.StatusCode.UNAVAILABLE.name,
+        grpc.StatusCode.DEADLINE_EXCEEDED.name,
+        grpc.StatusCode.UNIMPLEMENTED.name,
+        grpc.StatusCode.DATA_LOSS.name,
+    }
+)
+
+
+def _status_code(
+    context: grpc.aio.ServicerContext,
+    error: BaseException | None,
+) -> str:
+    code = context.code()
+    if code is None:
+        return "OK" if error is None else grpc.StatusCode.UNKNOWN.name
+    return getattr(code, "name", str(code))
+
+
+def _metadata_value(
+    handler_call_details: grpc.HandlerCallDetails,
+    key: str,
+) -> str | None:
+    for item_key, value in handler_call_details.invocation_metadata or ():
+        if item_key == key:
+            return value
+    return None
+
+
+class CallInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Base for interceptors that run each unary call inside a context manager
+    returned by ``around``.
+    """
+
+    def around(
+        self,
+        method: str,
+        handler_call_details: grpc.HandlerCallDetails,
+        context: grpc.aio.ServicerContext,
+    ) -> AbstractContextManager:
+        raise NotImplementedError
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        # Only registered methods get here, so the set of names is fixed
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+
+        if handler.unary_unary is not None:
+            behavior = handler.unary_unary
+
+            async def unary_unary(request, context):
+                with self.around(method, handler_call_details, context):
+                    return await behavior(request, context)
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
+
+
+class MetricsInterceptor(CallInterceptor):
+    """Times every call by method and status code."""
+
+    @contextmanager
+    def around(self, method, handler_call_details, context) -> Iterator[None]:
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            grpc_request_seconds.labels(
+                method=method, code=_status_code(context, error)
+            ).observe(time.perf_counter() - start)
+
+
+class TracingInterceptor(CallInterceptor):
+    """
+    Opens a trace per call, continuing a ``traceparent`` from metadata.
+
+    Only server-side failures mark the trace as an error; aborts such as
+    UNAUTHENTICATED for a bad token are sampled like ordinary calls.
+    """
+
+    @contextmanager
+    def around(self, method, handler_call_details, context) -> Iterator[None]:
+        if not tracer.enabled:
+            yield
+            return
+
+        traceparent = _metadata_value(handler_call_details, "traceparent")
+        with tracer.start_trace(
+            f"gRPC {method}", traceparent, **{"rpc.method": method}
+        ) as root:
+            error = None
+            try:
+                yield
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                code = _status_code(context, error)
+                root.attributes["rpc.code"] = code
+                if code in _SERVER_ERROR_CODES:
+                    if error is not None:
+                        root.set_error(error)
+                    else:
+                        root.error = f"gRPC {code}"
+
+
+class ProfilingInterceptor(CallInterceptor):
+    """
+    Attaches the sampling profiler to selected calls.
+
+    A call is profiled when its ``x-profile`` metadata holds a valid trigger
+    token, or when random sampling picks it.
+    """
+
+    @contextmanager
+    def around(self, method, handler_call_details, context) -> Iterator[None]:
+        trigger = profiler.trigger(_metadata_value(handler_call_details, "x-profile"))
+        if trigger is None:
+            yield
+            return
+
+        with profiler.profile(f"gRPC {method}", trigger):
+            yield
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from pathlib import Path
 
 import uvicorn
 import grpc
@@ -6,10 +8,34 @@ from fastapi import FastAPI
 from fastapi.concurrency import asynccontextmanager
 
 from contracts.gen import auth_pb2_grpc
+from core.config import settings
+from core.hashing import password_hasher
+from core.key_ring import watch_key_directory
 from core.logging_config import setup_logging
+from core.loop_monitor import loop_monitor
+from core.tracing import tracer
+from db import db_session_manager
+from db.replicas import replica_set
 from interfaces.grpc.auth_server import AuthGrpcServicer
+from interfaces.grpc.interceptors import (
+    MetricsInterceptor,
+    ProfilingInterceptor,
+    TracingInterceptor,
+)
+from interfaces.api.admin_routes import router as admin_router
 from interfaces.api.auth_routes import router as auth_router
+from interfaces.api.jwks_routes import router as jwks_router
+from interfaces.api.metrics_routes import router as metrics_router
+from interfaces.api.middleware import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    TracingMiddleware,
+)
 from interfaces.api.user_routes import router as user_router
+from services.email_filter import email_filter
+from services.session_reaper import session_reaper
+from services.session_service import revoked_sessions
+from services.token_service import token_service
 
 # Setup logging
 setup_logging()
@@ -22,7 +48,41 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting auth service...")
 
-    grpc_server = grpc.aio.server()
+    # Start the hashing pool before the gRPC server so workers are not
+    # spawned while requests are already being served
+    password_hasher.start()
+
+    background_tasks: list[asyncio.Task] = [
+        asyncio.create_task(revoked_sessions.run()),
+        asyncio.create_task(session_reaper.run()),
+    ]
+    if replica_set is not None:
+        background_tasks.append(asyncio.create_task(replica_set.run()))
+    if settings.loop_monitor_enabled:
+        background_tasks.append(asyncio.create_task(loop_monitor.run()))
+    if tracer.exporter is not None:
+        background_tasks.append(asyncio.create_task(tracer.exporter.run()))
+    if settings.email_filter_enabled:
+        background_tasks.append(asyncio.create_task(email_filter.run()))
+    if settings.jwt_keys_dir:
+        background_tasks.append(
+            asyncio.create_task(
+                watch_key_directory(
+                    token_service.key_ring,
+                    Path(settings.jwt_keys_dir),
+                    settings.jwt_algorithm,
+                    settings.jwt_keys_reload_interval_seconds,
+                )
+            )
+        )
+
+    grpc_server = grpc.aio.server(
+        interceptors=[
+            TracingInterceptor(),
+            MetricsInterceptor(),
+            ProfilingInterceptor(),
+        ]
+    )
     auth_pb2_grpc.add_AuthServiceServicer_to_server(AuthGrpcServicer(), grpc_server)
     grpc_server.add_insecure_port("[::]:50051")
     await grpc_server.start()
@@ -32,9 +92,21 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down auth service...")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
     await grpc_server.stop(5)
     logger.info("gRPC server stopped")
 
+    password_hasher.shutdown()
+    logger.info("Password hasher stopped")
+
+    await db_session_manager.close()
+    if replica_set is not None:
+        await replica_set.close()
+    logger.info("Database connections closed")
+
 
 app = FastAPI(
     title="Auth Service",
@@ -47,6 +119,13 @@ app = FastAPI(
 # Include routers with tags
 app.include_router(auth_router, tags=["Authentication"])
 app.include_router(user_router, prefix="/users", tags=["Users"])
+app.include_router(jwks_router, tags=["Keys"])
+app.include_router(metrics_router, tags=["Monitoring"])
+app.include_router(admin_router, prefix="/admin", tags=["Admin"])
+
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 
 @app.get("/health", tags=["Health"])
@@ -1,18 +1,33 @@
 import logging
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from db.models import User
+import secrets
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import UTC, datetime
+from typing import TypeVar
+
+
+from db import LazySession
+from db.records import LoginRecord, UserSnapshot
+from db.replicas import replica_set, ReplicaSet
+from core.admission import AdmissionController
+from core.config import settings
 from core.schemas.user import UserCreate, TokenResponse
-from core.security import verify_password
+from core.hashing import password_hasher
+from core.metrics import count_outcomes
+from core.tracing import tracer
 from core.exceptions import (
     InvalidCredentialsError,
     InvalidTokenError,
 )
+from services.email_filter import email_filter, EmailFilter
+from services.session_service import session_service, SessionService
 from services.user_service import user_service, UserService
 from services.token_service import token_service, TokenService
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -21,22 +36,55 @@ class AuthService:
         self,
         user_service: UserService,
         token_service: TokenService,
+        session_service: SessionService,
+        login_admission: AdmissionController,
+        email_filter: EmailFilter | None = None,
+        replicas: ReplicaSet | None = None,
     ):
         self.user_service = user_service
         self.token_service = token_service
-
-    def _create_user_payload(self, user: User) -> dict:
-        """Create a standardized token payload from a user."""
+        self.session_service = session_service
+        self.login_admission = login_admission
+        self.email_filter = email_filter
+        self.replicas = replicas
+        self._dummy_hash: str | None = None
+
+    async def _verify_dummy_password(self, password: str) -> None:
+        """Spend a bcrypt verify so unknown emails take as long as known ones."""
+        if self._dummy_hash is None:
+            self._dummy_hash = await password_hasher.hash(secrets.token_urlsafe(16))
+        await password_hasher.verify(password, self._dummy_hash)
+
+    async def _read(
+        self,
+        user_ids: Iterable[int],
+        session: LazySession,
+        query: Callable[[LazySession], Awaitable[T]],
+    ) -> T:
+        """Run a read-only user lookup on a replica when one may serve it."""
+        if self.replicas is None:
+            return await query(session)
+        return await self.replicas.read(user_ids, session, query)
+
+    def _create_user_payload(
+        self,
+        user: LoginRecord | UserSnapshot,
+        family_id: uuid.UUID,
+    ) -> dict:
+        """Create a standardized token payload from a user and session family."""
         return {
             "sub": str(user.id),
             "email": user.email,
+            "sid": str(family_id),
         }
 
+    @tracer.traced("AuthService.register_user")
+    @count_outcomes("register")
     async def register_user(
         self,
         user_data: UserCreate,
-        session: AsyncSession,
-    ) -> User:
+        session: LazySession,
+    ) -> UserSnapshot:
         """
         Register a new user.
 
@@ -45,22 +93,35 @@ class AuthService:
             session: Database session
 
         Returns:
-            Created user object
+            Snapshot of the created user
 
         Raises:
             UserAlreadyExistsError: If user already exists
         """
-        return await self.user_service.create_user(session, user_data)
+        user = await self.user_service.create_user(session, user_data)
+        if self.email_filter is not None:
+            self.email_filter.add(user.email)
+        return user
 
+    @tracer.traced("AuthService.authenticate_user")
+    @count_outcomes("login")
     async def authenticate_user(
         self,
         email: str,
         password: str,
-        session: AsyncSession,
+        session: LazySession,
     ) -> TokenResponse:
         """
         Authenticate a user and return tokens.
 
+        Logins pass through admission control first, so when bcrypt is
+        saturated excess requests are shed before touching the database or
+        the hashing pool. Emails the registered email filter has never seen
+        skip the database lookup; every failure path still performs one
+        bcrypt verify so response timing doesn't reveal which emails exist.
+        The database connection is released before the verify, so slow
+        hashing never holds a pooled connection.
+
         Args:
             email: User email
             password: Plain text password
@@ -71,19 +132,37 @@ class AuthService:
 
         Raises:
             InvalidCredentialsError: If credentials are invalid
+            ServiceOverloadedError: If the login was shed under load
         """
-        user = await self.user_service.get_user_by_email(session, email)
-
-        if not user or not verify_password(password, user.hashed_password):
-            logger.warning(f"Failed authentication attempt for email: {email}")
-            raise InvalidCredentialsError("Invalid email or password")
+        async with self.login_admission.admit():
+            user = None
+            if self.email_filter is None or self.email_filter.might_exist(email):
+                user = await self.user_service.get_login_record(session, email)
+                # Don't hold a pooled connection through the password verify
+                await session.release()
+
+            if not user:
+                await self._verify_dummy_password(password)
+                logger.warning(f"Failed authentication attempt for email: {email}")
+                raise InvalidCredentialsError("Invalid email or password")
+
+            if not await password_hasher.verify(password, user.hashed_password):
+                logger.warning(f"Failed authentication attempt for email: {email}")
+                raise InvalidCredentialsError("Invalid email or password")
 
         if not user.is_active:
             logger.warning(f"Inactive user attempted login: {email}")
             raise InvalidCredentialsError("User account is inactive")
 
-        payload = self._create_user_payload(user)
-        access_token, refresh_token = self.token_service.create_token_pair(payload)
+        refresh_session = self.session_service.create_session(session, user.id)
+        # Read before committing, which expires loaded attributes
+        payload = self._create_user_payload(user, refresh_session.family_id)
+        refresh_jti = str(refresh_session.jti)
+        await session.commit()
+
+        access_token, refresh_token = self.token_service.create_token_pair(
+            payload, refresh_jti=refresh_jti
+        )
 
         logger.info(f"User authenticated successfully: {email}")
 
@@ -92,23 +171,30 @@ class AuthService:
             refresh_token=refresh_token,
         )
 
+    @tracer.traced("AuthService.refresh_access_token")
+    @count_outcomes("refresh")
     async def refresh_access_token(
         self,
         refresh_token: str,
-        session: AsyncSession,
+        session: LazySession,
     ) -> TokenResponse:
         """
-        Refresh an access token using a refresh token.
+        Rotate a refresh token into a new access and refresh token pair.
+
+        The presented refresh token is consumed; presenting it again
+        revokes every token issued from the same login. Tokens issued
+        before sessions were tracked carry no ``sid``; they are consumed
+        the same way and start a new session family on their first refresh.
 
         Args:
             refresh_token: Refresh token
             session: Database session
 
         Returns:
-            Token response with new access token
+            Token response with new access and refresh tokens
 
         Raises:
-            InvalidTokenError: If refresh token is invalid
+            InvalidTokenError: If refresh token is invalid, revoked or reused
             UserNotFoundError: If user is not found
         """
         # Decode and validate the refresh token (checks type automatically)
@@ -121,40 +207,90 @@ class AuthService:
             logger.warning("Refresh token missing 'sub' claim")
             raise InvalidTokenError("Invalid refresh token")
 
+        family_id = payload.get("sid")
+        if family_id is not None and self.session_service.revoked.is_revoked(
+            family_id
+        ):
+            raise InvalidTokenError("Session has been revoked")
+
         # Get user and verify they exist and are active
-        user = await self.user_service.get_user_by_id(session, int(user_id))
+        user = await self.user_service.get_user_snapshot(session, int(user_id))
 
         if not user.is_active:
             logger.warning(f"Inactive user attempted token refresh: {user.email}")
             raise InvalidCredentialsError("User account is inactive")
 
-        # Create new access token
-        payload = self._create_user_payload(user)
-        access_token = self.token_service.create_access_token(payload)
+        if family_id is None:
+            refresh_session = await self.session_service.rotate_legacy(
+                session,
+                payload.get("jti"),
+                user.id,
+                datetime.fromtimestamp(payload["exp"], UTC),
+            )
+        else:
+            refresh_session = await self.session_service.rotate(
+                session, payload.get("jti")
+            )
+        payload = self._create_user_payload(user, refresh_session.family_id)
+        refresh_jti = str(refresh_session.jti)
+        await session.commit()
+        # The presented token is consumed; don't keep its payload cached
+        self.token_service.revoke_token(refresh_token)
+
+        access_token, refresh_token = self.token_service.create_token_pair(
+            payload, refresh_jti=refresh_jti
+        )
 
-        logger.info(f"Access token refreshed for user: {user.email}")
+        logger.info(f"Tokens refreshed for user: {user.email}")
 
-        return TokenResponse(access_token=access_token)
+        return TokenResponse(
+            access_token=access_token,
+            refresh_token=refresh_token,
+        )
 
-    async def get_user_from_token(
+    @tracer.traced("AuthService.logout")
+    @count_outcomes("logout")
+    async def logout(
         self,
-        token: str,
-        session: AsyncSession,
-    ) -> User:
+        refresh_token: str,
+        session: LazySession,
+    ) -> None:
         """
-        Get user from an access token.
+        Revoke the session a refresh token belongs to.
+
+        Both the refresh tokens and the access tokens of the session stop
+        being accepted.
 
         Args:
-            token: Access token
+            refresh_token: Refresh token
             session: Database session
 
-        Returns:
-            User object
-
         Raises:
-            InvalidTokenError: If token is invalid or not an access token
-            UserNotFoundError: If user is not found
+            InvalidTokenError: If refresh token is invalid
         """
+        payload = self.token_service.decode_token(
+            refresh_token, expected_type="refresh"
+        )
+
+        user_id = payload.get("sub")
+        family_id = payload.get("sid")
+        if not user_id or not family_id:
+            raise InvalidTokenError("Refresh token has no session to revoke")
+
+        try:
+            family_uuid = uuid.UUID(family_id)
+        except ValueError as e:
+            raise InvalidTokenError("Invalid refresh token") from e
+
+        await self.session_service.revoke_family(
+            session, family_uuid, int(user_id), reason="logout"
+        )
+        await session.commit()
+        self.token_service.revoke_token(refresh_token)
+        logger.info(f"Session {family_id} revoked for user: {user_id}")
+
+    def _get_user_id_from_access_token(self, token: str) -> int:
+        """Decode an access token and return the user id from its 'sub' claim."""
         # Decode and validate the access token (checks type automatically)
         payload = self.token_service.decode_token(token, expected_type="access")
 
@@ -163,8 +299,46 @@ class AuthService:
             logger.warning("Access token missing 'sub' claim")
             raise InvalidTokenError("Invalid access token")
 
-        # Get user
-        user = await self.user_service.get_user_by_id(session, int(user_id))
+        # In-memory lookup; revocations never cost a query here
+        family_id = payload.get("sid")
+        if family_id is not None and self.session_service.revoked.is_revoked(
+            family_id
+        ):
+            raise InvalidTokenError("Session has been revoked")
+        return int(user_id)
+
+    @tracer.traced("AuthService.get_user_from_token")
+    @count_outcomes("validate")
+    async def get_user_from_token(
+        self,
+        token: str,
+        session: LazySession,
+    ) -> UserSnapshot:
+        """
+        Get user from an access token.
+
+        Args:
+            token: Access token
+            session: Database session
+
+        Returns:
+            Snapshot of the user
+
+        Raises:
+            InvalidTokenError: If token is invalid or not an access token
+            UserNotFoundError: If user is not found
+        """
+        user_id = self._get_user_id_from_access_token(token)
+
+        # Get user, hitting the database only on a snapshot cache miss
+        user = await self._read(
+            (user_id,),
+            session,
+            lambda read_session: self.user_service.get_user_snapshot(
+                read_session, user_id
+            ),
+        )
+        await session.release()
 
         if not user.is_active:
             logger.warning(f"Inactive user attempted to use access token: {user.email}")
@@ -176,4 +350,19 @@ class AuthService:
 auth_service = AuthService(
     user_service=user_service,
     token_service=token_service,
+    session_service=session_service,
+    login_admission=AdmissionController(
+        name="login",
+        max_in_flight=(
+            settings.login_max_in_flight or 2 * password_hasher.max_workers
+        ),
+        min_in_flight=settings.login_min_in_flight,
+        max_queue=settings.login_max_queue,
+        queue_timeout=settings.login_queue_timeout_seconds,
+        # End to end, so a backed-up worker pool shrinks the limit even while
+        # each bcrypt call stays as fast as ever
+        latency_source=lambda: password_hasher.stats.ewma_latency_seconds,
+    ),
+    email_filter=email_filter if settings.email_filter_enabled else None,
+    replicas=replica_set,
 )
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.bloom import BloomFilter
+from core.config import settings
+from db import db_session_manager
+from db.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(email: str) -> str:
+    # Lowercase so the filter is a superset of any case variant in the table
+    return email.strip().lower()
+
+
+class EmailFilter:
+    """
+    Probabilistic set of registered emails used to skip lookups on login.
+
+    The filter is built from the users table at startup, extended on
+    registration, caught up with rows inserted elsewhere (other instances,
+    bulk imports) by polling for recently created users, and periodically
+    rebuilt to resize it and shed deleted emails. Until the first build
+    completes every email is treated as possibly registered.
+
+    Ids and created_at are assigned when a row is inserted, not when it
+    commits, so a slow transaction can commit a row older than ones a sync
+    already read. Each sync therefore re-reads users created up to
+    ``sync_overlap`` seconds before the previous read began, which catches
+    every insert whose transaction is shorter than that.
+    """
+
+    _PARTITION_SIZE = 10_000
+
+    def __init__(
+        self,
+        error_rate: float,
+        sync_interval: float,
+        rebuild_interval: float,
+        sync_overlap: float,
+    ):
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.skipped_lookups = 0
+        self._filter: BloomFilter | None = None
+        self._building: BloomFilter | None = None
+        self._last_read_at: datetime | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_exist(self, email: str) -> bool:
+        """Return False only if the email is definitely not registered."""
+        if self._filter is None or _normalize(email) in self._filter:
+            return True
+        self.skipped_lookups += 1
+        return False
+
+    def add(self, email: str) -> None:
+        """Record a newly registered email."""
+        for bloom in (self._filter, self._building):
+            if bloom is not None:
+                bloom.add(_normalize(email))
+
+    async def _load(
+        self,
+        session: AsyncSession,
+        bloom: BloomFilter,
+        created_after: datetime | None,
+    ) -> datetime:
+        """
+        Add emails of users created after created_after (all users if None).
+
+        Returns:
+            Database time when the read's transaction began; every row it
+            missed commits later than this
+        """
+        # The same clock and time zone the created_at default uses
+        started_at = await session.scalar(select(func.localtimestamp()))
+        query = select(User.email)
+        if created_after is not None:
+            query = query.where(User.created_at > created_after)
+        result = await session.stream(query)
+        async for partition in result.partitions(self._PARTITION_SIZE):
+            for (email,) in partition:
+                email = _normalize(email)
+                # Overlapping syncs see most rows again
+                if email not in bloom:
+                    bloom.add(email)
+            # Building over millions of rows must not monopolize the loop
+            await asyncio.sleep(0)
+        return started_at
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Build a fresh filter sized for the current table."""
+        start = time.perf_counter()
+        count = await session.scalar(select(func.count()).select_from(User))
+        # Leave headroom for registrations until the next rebuild
+        bloom = BloomFilter(
+            capacity=int(count * 1.5) + 1000,
+            error_rate=self.error_rate,
+        )
+        # Registrations on this instance during the build go in via add()
+        self._building = bloom
+        try:
+            read_at = await self._load(session, bloom, created_after=None)
+        finally:
+            self._building = None
+        self._filter = bloom
+        self._last_read_at = read_at
+        logger.info(
+            f"Built email filter with {bloom.count} emails "
+            f"({bloom.size_bytes} bytes) in {time.perf_counter() - start:.1f}s"
+        )
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Add users committed since the last build or sync."""
+        if self._filter is None or self._last_read_at is None:
+            return
+        self._last_read_at = await self._load(
+            session,
+            self._filter,
+            created_after=self._last_read_at - self.sync_overlap,
+        )
+
+    async def run(self) -> None:
+        """Keep the filter built and current; runs until cancelled."""
+        last_rebuild = float("-inf")
+        while True:
+            try:
+                async with db_session_manager.sessionmaker() as session:
+                    if time.monotonic() - last_rebuild >= self.rebuild_interval:
+                        await self.rebuild(session)
+                        last_rebuild = time.monotonic()
+                    else:
+                        await self.sync(session)
+            except Exception as e:
+                logger.error(f"Email filter refresh failed: {str(e)}")
+            await asyncio.sleep(self.sync_interval)
+
+
+email_filter = EmailFilter(
+    error_rate=settings.email_filter_error_rate,
+    sync_interval=settings.email_filter_sync_interval_seconds,
+    rebuild_interval=settings.email_filter_rebuild_interval_seconds,
+    sync_overlap=settings.email_filter_sync_overlap_seconds,
+)
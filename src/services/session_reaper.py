@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db import db_session_manager
+from db.models import RefreshSession, RevokedSession
+from services.auth_service import auth_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReapReport:
+    """Outcome of one cleanup pass over a table."""
+
+    table: str
+    rows: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class ExpiredSessionReaper:
+    """
+    Background deletion of expired refresh sessions and revocations.
+
+    Rows are deleted in bounded batches, each in its own short transaction,
+    selected with a range predicate on the indexed ``expires_at`` column.
+    Rows locked by in-flight refreshes are skipped, not waited for. The
+    reaper pauses between batches and backs off while logins are queued,
+    so it never competes with login traffic for connections.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        batch_size: int,
+        batch_pause: float,
+        busy_backoff: float,
+        is_busy: Callable[[], bool] | None = None,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.busy_backoff = busy_backoff
+        self._is_busy = is_busy or (lambda: False)
+
+    async def _delete_batch(
+        self,
+        session: AsyncSession,
+        model: type[RefreshSession] | type[RevokedSession],
+        cutoff: datetime,
+    ) -> int:
+        (pk,) = model.__mapper__.primary_key
+        expired = (
+            select(pk)
+            .where(model.expires_at < cutoff)
+            .order_by(model.expires_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(delete(model).where(pk.in_(expired)))
+        await session.commit()
+        return result.rowcount
+
+    async def reap(
+        self,
+        model: type[RefreshSession] | type[RevokedSession],
+    ) -> ReapReport:
+        """
+        Delete rows of a table that expired before now.
+
+        Returns:
+            Rows deleted, batches run and time spent
+        """
+        report = ReapReport(table=model.__tablename__)
+        # A fixed cutoff keeps the pass finite while rows keep expiring
+        cutoff = datetime.now(UTC)
+        start = time.perf_counter()
+
+        while True:
+            while self._is_busy():
+                await asyncio.sleep(self.busy_backoff)
+
+            async with db_session_manager.sessionmaker() as session:
+                deleted = await self._delete_batch(session, model, cutoff)
+            report.rows += deleted
+            report.batches += 1
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    async def run(self) -> None:
+        """Reap expired rows periodically; runs until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            for model in (RefreshSession, RevokedSession):
+                try:
+                    report = await self.reap(model)
+                except Exception as e:
+                    logger.error(f"Cleanup of {model.__tablename__} failed: {str(e)}")
+                    continue
+                if report.rows:
+                    logger.info(
+                        f"Deleted {report.rows} expired rows from {report.table} "
+                        f"in {report.batches} batches "
+                        f"({report.elapsed_seconds:.2f}s)"
+                    )
+
+
+session_reaper = ExpiredSessionReaper(
+    interval=settings.reaper_interval_seconds,
+    batch_size=settings.reaper_batch_size,
+    batch_pause=settings.reaper_batch_pause_seconds,
+    busy_backoff=settings.reaper_busy_backoff_seconds,
+    is_busy=lambda: auth_service.login_admission.saturated,
+)
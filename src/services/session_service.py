@@ -0,0 +1,323 @@
+import asyncio
+import heapq
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import NoReturn
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.exceptions import InvalidTokenError, RefreshTokenReuseError
+from db import db_session_manager
+from db.models import RefreshSession, RevokedSession
+from services.token_service import token_service
+
+logger = logging.getLogger(__name__)
+
+
+class RevokedSessions:
+    """
+    In-memory set of revoked refresh token families.
+
+    Validation checks membership with a dict lookup and never queries the
+    database. The set is loaded incrementally by ``revoked_at`` and pruned
+    as families expire, so it only holds families that could still present
+    an unexpired token. A heap ordered by expiry lets pruning touch only
+    the expired families. Revocations made on other instances become
+    visible within one sync interval.
+    """
+
+    # Revocations committed late can carry a revoked_at slightly behind the
+    # watermark; re-reading this much of the past catches them
+    _WATERMARK_OVERLAP = timedelta(seconds=30)
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._expires_at: dict[str, datetime] = {}
+        # May hold stale entries for families re-added with a new expiry
+        self._expiry_heap: list[tuple[datetime, str]] = []
+        self._watermark: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def is_revoked(self, family_id: str) -> bool:
+        """Return True if the family has been revoked."""
+        return family_id in self._expires_at
+
+    def add(self, family_id: str, expires_at: datetime) -> None:
+        """Record a revocation made on this instance."""
+        if self._expires_at.get(family_id) == expires_at:
+            return
+        self._expires_at[family_id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, family_id))
+
+    def _prune(self, now: datetime) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, family_id = heapq.heappop(heap)
+            if self._expires_at.get(family_id) == expires_at:
+                del self._expires_at[family_id]
+
+    async def sync(self, session: AsyncSession) -> None:
+        """Load revocations made since the last sync and drop expired ones."""
+        now = datetime.now(UTC)
+        query = select(
+            RevokedSession.family_id,
+            RevokedSession.expires_at,
+            RevokedSession.revoked_at,
+        ).where(RevokedSession.expires_at > now)
+        if self._watermark is not None:
+            query = query.where(
+                RevokedSession.revoked_at > self._watermark - self._WATERMARK_OVERLAP
+            )
+
+        for family_id, expires_at, revoked_at in await session.execute(query):
+            self.add(str(family_id), expires_at)
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+        if self._watermark is None:
+            self._watermark = now
+
+        self._prune(now)
+
+    async def run(self) -> None:
+        """Keep the revoked set current; runs until cancelled."""
+        while True:
+            try:
+                async with db_session_manager.sessionmaker() as session:
+                    await self.sync(session)
+            except Exception as e:
+                logger.error(f"Revoked session sync failed: {str(e)}")
+            await asyncio.sleep(self.sync_interval)
+
+
+class SessionService:
+    """
+    Service for refresh token sessions.
+
+    Every refresh token has a row keyed by its ``jti``. Tokens issued from
+    one login share a family id, carried in the ``sid`` claim of both the
+    refresh and access tokens. Refreshing rotates the token: the old row is
+    marked rotated and a new one is issued in the same family. Presenting
+    a rotated token again means it leaked, so the whole family is revoked.
+    """
+
+    @staticmethod
+    def _parse_jti(jti: str | None) -> uuid.UUID:
+        try:
+            return uuid.UUID(jti)
+        except (TypeError, ValueError) as e:
+            raise InvalidTokenError("Invalid refresh token") from e
+
+    def __init__(self, revoked: RevokedSessions, lifetime: timedelta):
+        self.revoked = revoked
+        self.lifetime = lifetime
+
+    def create_session(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        family_id: uuid.UUID | None = None,
+    ) -> RefreshSession:
+        """
+        Record a new refresh token, starting a new family unless one is given.
+
+        Args:
+            session: Database session
+            user_id: Owner of the session
+            family_id: Family to issue the token in
+
+        Returns:
+            The pending session row; its jti is the refresh token's jti
+        """
+        refresh_session = RefreshSession(
+            jti=uuid.uuid4(),
+            family_id=family_id or uuid.uuid4(),
+            user_id=user_id,
+            expires_at=datetime.now(UTC) + self.lifetime,
+        )
+        session.add(refresh_session)
+        return refresh_session
+
+    async def rotate(
+        self,
+        session: AsyncSession,
+        jti: str,
+    ) -> RefreshSession:
+        """
+        Consume a refresh token and issue its replacement.
+
+        Marking the old row rotated is a single conditional UPDATE, so two
+        concurrent refreshes with the same token cannot both succeed.
+
+        Args:
+            session: Database session
+            jti: jti claim of the presented refresh token
+
+        Returns:
+            The pending replacement session row
+
+        Raises:
+            RefreshTokenReuseError: If the token was already rotated; its
+                family is revoked and committed before raising
+            InvalidTokenError: If the token has no active session
+        """
+        old_jti = self._parse_jti(jti)
+        new_jti = uuid.uuid4()
+        result = await session.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.jti == old_jti,
+                RefreshSession.rotated_at.is_(None),
+                RefreshSession.expires_at > datetime.now(UTC),
+            )
+            .values(rotated_at=datetime.now(UTC), replaced_by=new_jti)
+            .returning(RefreshSession.family_id, RefreshSession.user_id)
+        )
+        rotated = result.one_or_none()
+        if rotated is None:
+            await self._reject_inactive(session, old_jti)
+
+        refresh_session = RefreshSession(
+            jti=new_jti,
+            family_id=rotated.family_id,
+            user_id=rotated.user_id,
+            expires_at=datetime.now(UTC) + self.lifetime,
+        )
+        session.add(refresh_session)
+        return refresh_session
+
+    async def rotate_legacy(
+        self,
+        session: AsyncSession,
+        jti: str,
+        user_id: int,
+        expires_at: datetime,
+    ) -> RefreshSession:
+        """
+        Consume a refresh token issued before sessions were tracked.
+
+        Such a token has no row and no ``sid``. Its jti is recorded as an
+        already rotated session, so presenting it a second time is caught
+        as reuse like any other rotated token, and its replacement starts
+        a new family.
+
+        Args:
+            session: Database session
+            jti: jti claim of the presented refresh token
+            user_id: Owner of the token
+            expires_at: Expiry of the presented token
+
+        Returns:
+            The pending replacement session row
+
+        Raises:
+            RefreshTokenReuseError: If the token was already consumed; the
+                family it started is revoked and committed before raising
+            InvalidTokenError: If the token has no valid jti
+        """
+        old_jti = self._parse_jti(jti)
+        family_id = uuid.uuid4()
+        new_jti = uuid.uuid4()
+        # The primary key makes two concurrent refreshes with the same
+        # token conflict, so only one of them inserts
+        result = await session.execute(
+            insert(RefreshSession)
+            .values(
+                jti=old_jti,
+                family_id=family_id,
+                user_id=user_id,
+                expires_at=expires_at,
+                rotated_at=datetime.now(UTC),
+                replaced_by=new_jti,
+            )
+            .on_conflict_do_nothing(index_elements=[RefreshSession.jti])
+            .returning(RefreshSession.jti)
+        )
+        if result.one_or_none() is None:
+            await self._reject_inactive(session, old_jti)
+
+        refresh_session = RefreshSession(
+            jti=new_jti,
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.now(UTC) + self.lifetime,
+        )
+        session.add(refresh_session)
+        return refresh_session
+
+    async def _reject_inactive(
+        self,
+        session: AsyncSession,
+        jti: uuid.UUID,
+    ) -> NoReturn:
+        """Raise for a token that could not be rotated, revoking it if reused."""
+        previous = (
+            await session.execute(
+                select(
+                    RefreshSession.family_id,
+                    RefreshSession.user_id,
+                    RefreshSession.rotated_at,
+                ).where(RefreshSession.jti == jti)
+            )
+        ).one_or_none()
+        if previous is not None and previous.rotated_at is not None:
+            logger.warning(
+                f"Refresh token reuse detected for user {previous.user_id}, "
+                f"revoking session {previous.family_id}"
+            )
+            await self.revoke_family(
+                session, previous.family_id, previous.user_id, reason="reuse"
+            )
+            await session.commit()
+            raise RefreshTokenReuseError("Refresh token has already been used")
+        raise InvalidTokenError("Refresh token session is not active")
+
+    async def revoke_family(
+        self,
+        session: AsyncSession,
+        family_id: uuid.UUID,
+        user_id: int,
+        reason: str,
+    ) -> None:
+        """
+        Revoke every refresh and access token of a family.
+
+        The caller commits. The revocation takes effect on this instance
+        immediately and on others after their next sync.
+        """
+        now = datetime.now(UTC)
+        # Any token of the family was issued by now, so none outlives this
+        expires_at = now + self.lifetime
+        await session.execute(
+            insert(RevokedSession)
+            .values(
+                family_id=family_id,
+                user_id=user_id,
+                reason=reason,
+                expires_at=expires_at,
+            )
+            .on_conflict_do_nothing(index_elements=[RevokedSession.family_id])
+        )
+        await session.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.family_id == family_id,
+                RefreshSession.rotated_at.is_(None),
+            )
+            .values(rotated_at=now)
+        )
+        self.revoked.add(str(family_id), expires_at)
+
+
+revoked_sessions = RevokedSessions(
+    sync_interval=settings.revocation_sync_interval_seconds,
+)
+session_service = SessionService(
+    revoked=revoked_sessions,
+    lifetime=token_service.refresh_token_lifetime,
+)
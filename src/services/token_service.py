@@ -1,38 +1,88 @@
+import hashlib
+import json
 import logging
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Literal
 
 import jwt
 
+from core.cache import TTLCache
 from core.config import settings
+from core.key_ring import KeyRing, build_key_ring
+from core.metrics import jwt_seconds
+from core.tracing import tracer
 from core.exceptions import TokenExpiredError, InvalidTokenError, InvalidTokenTypeError
 
 logger = logging.getLogger(__name__)
 
 TokenType = Literal["access", "refresh"]
 
+_encode_seconds = jwt_seconds.labels(operation="encode")
+_decode_seconds = jwt_seconds.labels(operation="decode")
+
 
 class TokenService:
     """Service for creating and validating JWT tokens."""
 
     def __init__(
         self,
-        secret_key: str,
-        algorithm: str,
+        key_ring: KeyRing,
         access_token_expire_minutes: int,
         refresh_token_expire_days: int,
+        cache: TTLCache[bytes, tuple[str, dict]] | None = None,
     ):
-        self.secret_key = secret_key
-        self.algorithm = algorithm
+        self.key_ring = key_ring
         self.access_token_expire_minutes = access_token_expire_minutes
         self.refresh_token_expire_days = refresh_token_expire_days
+        self.cache = cache
+        self._key_ring_version = key_ring.version
+        self._key_fingerprints = {key.kid: key.fingerprint for key in key_ring}
+        self._jwks_document: tuple[bytes, str] | None = None
+
+    def _sync_key_ring(self) -> None:
+        """Drop state derived from the previous key set after a rotation."""
+        if self.key_ring.version == self._key_ring_version:
+            return
+        self._key_ring_version = self.key_ring.version
+        self._jwks_document = None
+        previous = self._key_fingerprints
+        self._key_fingerprints = {key.kid: key.fingerprint for key in self.key_ring}
+        # Retired or replaced keys must stop validating cached tokens right
+        # away. Reloads build new key objects even for unchanged files, so
+        # keys are compared by material; tokens signed with keys that are
+        # still accepted stay cached.
+        stale = {
+            kid
+            for kid, fingerprint in previous.items()
+            if self._key_fingerprints.get(kid) != fingerprint
+        }
+        if stale and self.cache is not None:
+            self.cache.pop_where(lambda _, entry: entry[0] in stale)
+
+    @staticmethod
+    def _cache_key(token: str) -> bytes:
+        """Key verified payloads by token digest so raw tokens are not retained."""
+        return hashlib.sha256(token.encode()).digest()
+
+    @staticmethod
+    def _check_type(payload: dict, expected_type: TokenType | None) -> None:
+        """Raise if the payload's token type doesn't match expected_type."""
+        if expected_type:
+            actual_type = payload.get("type")
+            if actual_type != expected_type:
+                logger.warning(
+                    f"Token type mismatch: expected {expected_type}, got {actual_type}"
+                )
+                raise InvalidTokenTypeError(expected_type, actual_type)
 
     def _create_token(
         self,
         payload: dict,
         token_type: TokenType,
         expires_delta: timedelta | None = None,
+        jti: str | None = None,
     ) -> str:
         """Create a JWT token with the given payload and type."""
         to_encode = payload.copy()
@@ -49,12 +99,19 @@ class TokenService:
             {
                 "exp": expire,
                 "iat": datetime.now(timezone.utc),
-                "jti": str(uuid.uuid4()),
+                "jti": jti or str(uuid.uuid4()),
                 "type": token_type,
             }
         )
 
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        key = self.key_ring.active
+        with tracer.span("jwt.encode"), _encode_seconds.time():
+            return jwt.encode(
+                to_encode,
+                key.signing_key,
+                algorithm=key.algorithm,
+                headers={"kid": key.kid},
+            )
 
     def create_access_token(
         self,
@@ -68,9 +125,15 @@ class TokenService:
         self,
         payload: dict,
         expires_delta: timedelta | None = None,
+        jti: str | None = None,
     ) -> str:
-        """Create a refresh token."""
-        return self._create_token(payload, "refresh", expires_delta)
+        """Create a refresh token, optionally with a caller-chosen jti."""
+        return self._create_token(payload, "refresh", expires_delta, jti)
+
+    @property
+    def refresh_token_lifetime(self) -> timedelta:
+        """Default lifetime of refresh tokens."""
+        return timedelta(days=self.refresh_token_expire_days)
 
     def decode_token(
         self,
@@ -80,6 +143,10 @@ class TokenService:
         """
         Decode and validate a JWT token.
 
+        Verified payloads are cached until the token's expiry, so repeated
+        validations of the same token skip signature verification. Callers
+        must treat the returned payload as read-only.
+
         Args:
             token: The JWT token to decode
             expected_type: Optional token type to validate against
@@ -92,24 +159,32 @@ class TokenService:
             InvalidTokenTypeError: If the token type doesn't match expected_type
             InvalidTokenError: If the token is invalid
         """
-        try:
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm],
-            )
+        self._sync_key_ring()
 
-            # Validate token type if specified
-            if expected_type:
-                actual_type = payload.get("type")
-                if actual_type != expected_type:
-                    logger.warning(
-                        f"Token type mismatch: expected {expected_type}, got {actual_type}"
-                    )
-                    raise InvalidTokenTypeError(expected_type, actual_type)
-
-            return payload
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(token)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                payload = entry[1]
+                self._check_type(payload, expected_type)
+                return payload
 
+        try:
+            # Tokens issued before kid headers were introduced use the active key
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = self.key_ring.active if kid is None else None
+            if isinstance(kid, str):
+                key = self.key_ring.get(kid)
+            if key is None:
+                raise jwt.InvalidTokenError(f"Unknown signing key {kid!r}")
+
+            with tracer.span("jwt.decode"), _decode_seconds.time():
+                payload = jwt.decode(
+                    token,
+                    key.verifying_key,
+                    algorithms=[key.algorithm],
+                )
         except jwt.ExpiredSignatureError as e:
             logger.debug(f"Token expired: {str(e)}")
             raise TokenExpiredError("Token has expired") from e
@@ -117,16 +192,62 @@ class TokenService:
             logger.error(f"Invalid token: {str(e)}")
             raise InvalidTokenError("Invalid token") from e
 
-    def create_token_pair(self, payload: dict) -> tuple[str, str]:
+        # Cache the verified payload until the token itself expires
+        if cache_key is not None and "exp" in payload:
+            self.cache.set(
+                cache_key, (key.kid, payload), ttl=payload["exp"] - time.time()
+            )
+
+        self._check_type(payload, expected_type)
+        return payload
+
+    def revoke_token(self, token: str) -> None:
+        """
+        Drop a token's verified payload from the cache.
+
+        Called once a refresh token is consumed or its session revoked, so
+        the payload of a dead token isn't kept in memory until it expires.
+        Revocation itself is enforced by the session checks in AuthService.
+        """
+        if self.cache is not None:
+            self.cache.pop(self._cache_key(token))
+
+    def create_token_pair(
+        self,
+        payload: dict,
+        refresh_jti: str | None = None,
+    ) -> tuple[str, str]:
         """Create both access and refresh tokens."""
         access_token = self.create_access_token(payload)
-        refresh_token = self.create_refresh_token(payload)
+        refresh_token = self.create_refresh_token(payload, jti=refresh_jti)
         return access_token, refresh_token
 
+    def get_jwks(self) -> dict:
+        """
+        Build the JSON Web Key Set of public verification keys.
+
+        HMAC secrets are never published, so they are left out of the set.
+
+        Returns:
+            JWKS dictionary with a "keys" list
+        """
+        return {
+            "keys": [jwk for key in self.key_ring if (jwk := key.to_jwk()) is not None]
+        }
+
+    def get_jwks_document(self) -> tuple[bytes, str]:
+        """Return the serialized JWKS and its ETag, computed once per key set."""
+        self._sync_key_ring()
+        if self._jwks_document is None:
+            body = json.dumps(self.get_jwks(), separators=(",", ":")).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            self._jwks_document = (body, etag)
+        return self._jwks_document
+
 
 token_service = TokenService(
-    secret_key=settings.jwt_secret_key,
-    algorithm=settings.jwt_algorithm,
+    key_ring=build_key_ring(settings),
     access_token_expire_minutes=settings.jwt_access_token_expire_minutes,
     refresh_token_expire_days=settings.jwt_refresh_token_expire_days,
+    cache=TTLCache(max_size=settings.token_cache_max_size),
 )
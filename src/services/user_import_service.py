@@ -0,0 +1,240 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from itertools import batched
+
+import asyncpg
+from pydantic import ValidationError
+
+from core.hashing import PasswordHasher, password_hasher
+from core.schemas.user import UserImportRow
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "users_import"
+STAGING_COLUMNS = (
+    "line",
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "hashed_password",
+)
+
+_CREATE_STAGING_TABLE = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    line integer NOT NULL,
+    first_name text NOT NULL,
+    last_name text NOT NULL,
+    username text NOT NULL,
+    email text NOT NULL,
+    hashed_password text NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+
+# ON CONFLICT DO NOTHING without a target skips rows violating any unique
+# index, including duplicates within the same batch
+_MERGE_STAGING_TABLE = f"""
+INSERT INTO users (
+    first_name, last_name, username, email, hashed_password,
+    is_active, is_superuser, is_verified
+)
+SELECT first_name, last_name, username, email, hashed_password, true, false, false
+FROM {STAGING_TABLE}
+ORDER BY line
+ON CONFLICT DO NOTHING
+RETURNING email, username
+"""
+
+_CLASSIFY_CONFLICTS = f"""
+SELECT s.line, s.email,
+       EXISTS (
+           SELECT 1 FROM users u WHERE lower(u.email) = lower(s.email)
+       ) AS email_taken
+FROM {STAGING_TABLE} s
+WHERE s.line = ANY($1::integer[])
+ORDER BY s.line
+"""
+
+
+@dataclass
+class RejectedRow:
+    """An input line that could not be parsed into a row."""
+
+    reason: str
+
+
+@dataclass
+class ImportIssue:
+    """A row that was not imported."""
+
+    line: int
+    kind: str  # "rejected" or "conflict"
+    reason: str
+    email: str | None = None
+
+
+@dataclass
+class ImportReport:
+    """Summary of a bulk import run."""
+
+    read: int = 0
+    inserted: int = 0
+    conflicts: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def _ignore_issue(issue: ImportIssue) -> None:
+    pass
+
+
+class UserImportService:
+    """Service for importing users in bulk through COPY."""
+
+    def __init__(self, hasher: PasswordHasher):
+        self.hasher = hasher
+
+    async def _prepare_batch(
+        self,
+        batch: tuple[tuple[int, dict | RejectedRow], ...],
+        report: ImportReport,
+        on_issue: Callable[[ImportIssue], None],
+    ) -> list[tuple]:
+        """Validate rows and hash plain passwords in the worker pool."""
+        rows: list[tuple[int, UserImportRow]] = []
+        for line, raw in batch:
+            if isinstance(raw, RejectedRow) or not isinstance(raw, dict):
+                report.rejected += 1
+                on_issue(
+                    ImportIssue(
+                        line=line,
+                        kind="rejected",
+                        reason=(
+                            raw.reason
+                            if isinstance(raw, RejectedRow)
+                            else "Row is not an object"
+                        ),
+                    )
+                )
+                continue
+            try:
+                rows.append((line, UserImportRow.model_validate(raw)))
+            except ValidationError as e:
+                report.rejected += 1
+                on_issue(
+                    ImportIssue(
+                        line=line,
+                        kind="rejected",
+                        reason=str(e.errors()[0]["msg"]),
+                        email=raw.get("email"),
+                    )
+                )
+
+        to_hash = [row.password for _, row in rows if row.hashed_password is None]
+        hashes = iter(await self.hasher.hash_many(to_hash))
+
+        return [
+            (
+                line,
+                row.first_name,
+                row.last_name,
+                row.username,
+                row.email,
+                row.hashed_password or next(hashes),
+            )
+            for line, row in rows
+        ]
+
+    async def _load_batch(
+        self,
+        conn: asyncpg.Connection,
+        records: list[tuple],
+        report: ImportReport,
+        on_issue: Callable[[ImportIssue], None],
+    ) -> None:
+        """COPY a batch into the staging table and merge it into users."""
+        async with conn.transaction():
+            await conn.copy_records_to_table(
+                STAGING_TABLE,
+                records=records,
+                columns=STAGING_COLUMNS,
+            )
+            returned = await conn.fetch(_MERGE_STAGING_TABLE)
+            # Rows merge in line order, so of several identical rows in a
+            # batch only the first was inserted and the rest are conflicts
+            inserted = Counter((row["email"], row["username"]) for row in returned)
+
+            conflicting_lines = []
+            for line, _, _, username, email, _ in records:
+                if inserted[(email, username)] > 0:
+                    inserted[(email, username)] -= 1
+                else:
+                    conflicting_lines.append(line)
+            if conflicting_lines:
+                for row in await conn.fetch(_CLASSIFY_CONFLICTS, conflicting_lines):
+                    field = "email" if row["email_taken"] else "username"
+                    on_issue(
+                        ImportIssue(
+                            line=row["line"],
+                            kind="conflict",
+                            reason=f"User with this {field} already exists",
+                            email=row["email"],
+                        )
+                    )
+
+        report.inserted += len(returned)
+        report.conflicts += len(records) - len(returned)
+
+    async def import_users(
+        self,
+        conn: asyncpg.Connection,
+        rows: Iterable[tuple[int, dict | RejectedRow]],
+        batch_size: int = 5_000,
+        on_issue: Callable[[ImportIssue], None] | None = None,
+    ) -> ImportReport:
+        """
+        Import users from a stream of numbered row dictionaries.
+
+        Rows are consumed lazily in batches, so memory use depends on
+        batch_size and not on the size of the input. Each batch is
+        committed on its own; rows that conflict with existing users are
+        skipped and reported, not overwritten.
+
+        Args:
+            conn: Dedicated asyncpg connection (not a pooled session)
+            rows: Line number and row pairs; rows have user fields and either
+                password or hashed_password, or are RejectedRow for input
+                lines that could not be parsed
+            batch_size: Rows per COPY and merge transaction
+            on_issue: Called for each rejected or conflicting row
+
+        Returns:
+            Import report with row counts
+        """
+        if on_issue is None:
+            on_issue = _ignore_issue
+
+        report = ImportReport()
+        start = time.perf_counter()
+        await conn.execute(_CREATE_STAGING_TABLE)
+
+        for batch in batched(rows, batch_size):
+            report.read += len(batch)
+            records = await self._prepare_batch(batch, report, on_issue)
+            if records:
+                await self._load_batch(conn, records, report, on_issue)
+            report.batches += 1
+            logger.info(
+                f"Imported batch {report.batches}: {report.inserted} inserted, "
+                f"{report.conflicts} conflicts, {report.rejected} rejected"
+            )
+
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+
+user_import_service = UserImportService(hasher=password_hasher)
@@ -1,128 +1,216 @@
 import logging
-from sqlalchemy import select
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from db.models import User
+from db.records import (
+    LOGIN_RECORD_COLUMNS,
+    USER_SNAPSHOT_COLUMNS,
+    LoginRecord,
+    UserSnapshot,
+)
+from db.replicas import replica_set, ReplicaSet
+from core.cache import TTLCache
+from core.config import settings
 from core.schemas.user import UserCreate
-from core.security import get_password_hash
+from core.hashing import password_hasher
+from core.metrics import db_query_seconds
+from core.rate_limit import normalize_email
 from core.exceptions import UserAlreadyExistsError, UserNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Unique indexes on users mapped to the field they protect
+_UNIQUE_INDEX_FIELDS = {
+    "ix_users_email": "email",
+    "ix_users_email_lower": "email",
+    "ix_users_username": "username",
+}
+
+
+def _unique_violation_field(error: IntegrityError) -> str | None:
+    """Return the user field behind a unique violation, if that's what it is."""
+    # The asyncpg adapter chains the driver exception, which names the index
+    driver_error = error.orig.__cause__ or error.orig
+    return _UNIQUE_INDEX_FIELDS.get(getattr(driver_error, "constraint_name", None))
+
 
 class UserService:
     """Service for user management operations."""
 
-    async def get_user_by_id(
+    def __init__(
+        self,
+        cache: TTLCache[int, UserSnapshot] | None = None,
+        replicas: ReplicaSet | None = None,
+    ):
+        self.cache = cache
+        self.replicas = replicas
+
+    async def get_user_snapshot(
         self,
         session: AsyncSession,
         user_id: int,
-    ) -> User:
+    ) -> UserSnapshot:
         """
-        Get a user by their ID.
+        Get an immutable snapshot of a user, reading through the user cache.
+
+        The database is only queried on a cache miss, selecting just the
+        snapshot columns without loading an ORM entity. Snapshots are
+        dropped from the cache when the user row is updated or deleted
+        through the ORM, and otherwise expire after the cache TTL.
 
         Args:
             session: Database session
             user_id: User ID
 
         Returns:
-            User object
+            User snapshot
 
         Raises:
             UserNotFoundError: If user is not found
         """
-        user = await session.get(User, user_id)
-        if not user:
+        if self.cache is not None:
+            snapshot = self.cache.get(user_id)
+            if snapshot is not None:
+                return snapshot
+
+        with db_query_seconds.labels(method="get_user_snapshot").time():
+            result = await session.execute(
+                select(*USER_SNAPSHOT_COLUMNS).where(User.id == user_id)
+            )
+            row = result.first()
+        if row is None:
             logger.debug(f"User not found with id: {user_id}")
             raise UserNotFoundError(f"User with id {user_id} not found")
-        return user
-
-    async def get_user_by_email(
+        snapshot = UserSnapshot.from_row(row)
+        if self.cache is not None:
+            self.cache.set(user_id, snapshot)
+        return snapshot
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop a user's cached snapshot after the row has changed."""
+        if self.cache is not None:
+            self.cache.pop(user_id)
+
+    def note_write(self, user_id: int) -> None:
+        """Read a user from the primary until their committed change replicates."""
+        if self.replicas is not None:
+            self.replicas.note_write(user_id)
+
+    async def get_login_record(
         self,
         session: AsyncSession,
         email: str,
-    ) -> User | None:
+    ) -> LoginRecord | None:
         """
-        Get a user by their email.
+        Get the columns a password login needs for the user with an email.
 
-        Args:
-            session: Database session
-            email: User email
-
-        Returns:
-            User object or None if not found
-        """
-        result = await session.scalar(select(User).where(User.email == email))
-        return result
-
-    async def get_user_by_username(
-        self,
-        session: AsyncSession,
-        username: str,
-    ) -> User | None:
-        """
-        Get a user by their username.
+        Emails match case-insensitively through the covering
+        ``ix_users_email_lower`` index, so the lookup is an index-only scan.
 
         Args:
             session: Database session
-            username: Username
+            email: User email
 
         Returns:
-            User object or None if not found
+            Login record or None if not found
         """
-        result = await session.scalar(select(User).where(User.username == username))
-        return result
+        with db_query_seconds.labels(method="get_login_record").time():
+            result = await session.execute(
+                select(*LOGIN_RECORD_COLUMNS).where(
+                    func.lower(User.email) == normalize_email(email)
+                )
+            )
+            row = result.first()
+        return LoginRecord.from_row(row) if row is not None else None
 
     async def create_user(
         self,
         session: AsyncSession,
         user_data: UserCreate,
-    ) -> User:
+    ) -> UserSnapshot:
         """
         Create a new user.
 
+        Uses a single INSERT ... RETURNING and relies on the unique indexes
+        on email and username, so concurrent registrations cannot both pass.
+
         Args:
             session: Database session
             user_data: User creation data
 
         Returns:
-            Created user object
+            Snapshot of the created user
 
         Raises:
             UserAlreadyExistsError: If user with email or username already exists
         """
-        # Check if user with email exists
-        if await self.get_user_by_email(session, user_data.email):
-            logger.warning(
-                f"Attempt to create user with existing email: {user_data.email}"
-            )
-            raise UserAlreadyExistsError(
-                f"User with email {user_data.email} already exists"
-            )
-
-        # Check if user with username exists
-        if await self.get_user_by_username(session, user_data.username):
-            logger.warning(
-                f"Attempt to create user with existing username: {user_data.username}"
-            )
-            raise UserAlreadyExistsError(
-                f"User with username {user_data.username} already exists"
-            )
-
-        new_user = User(
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            username=user_data.username,
-            email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
-        )
-
-        session.add(new_user)
-        await session.commit()
-        await session.refresh(new_user)
-
-        logger.info(f"Created new user: {new_user.email}")
-        return new_user
-
-
-user_service = UserService()
+        hashed_password = await password_hasher.hash(user_data.password)
+
+        try:
+            with db_query_seconds.labels(method="create_user").time():
+                result = await session.execute(
+                    insert(User)
+                    .values(
+                        first_name=user_data.first_name,
+                        last_name=user_data.last_name,
+                        username=user_data.username,
+                        email=user_data.email,
+                        hashed_password=hashed_password,
+                    )
+                    .returning(*USER_SNAPSHOT_COLUMNS)
+                )
+                snapshot = UserSnapshot.from_row(result.one())
+                await session.commit()
+        except IntegrityError as e:
+            await session.rollback()
+            field = _unique_violation_field(e)
+            if field is None:
+                raise
+            value = getattr(user_data, field)
+            logger.warning(f"Attempt to create user with existing {field}: {value}")
+            raise UserAlreadyExistsError(field, value) from e
+
+        self.note_write(snapshot.id)
+        logger.info(f"Created new user: {snapshot.email}")
+        return snapshot
+
+
+user_service = UserService(
+    cache=TTLCache(
+        max_size=settings.user_cache_max_size,
+        default_ttl=settings.user_cache_ttl_seconds,
+    ),
+    replicas=replica_set,
+)
+
+_CHANGED_USER_IDS_KEY = "changed_user_ids"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    """Remember which users were updated or deleted in this transaction."""
+    changed = {
+        obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)
+    }
+    if changed:
+        session.info.setdefault(_CHANGED_USER_IDS_KEY, set()).update(changed)
+        # Invalidate early as well, so readers stop using the old snapshot
+        # while the transaction is still open
+        for user_id in changed:
+            user_service.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    """Drop snapshots of changed users once their changes are committed."""
+    for user_id in session.info.pop(_CHANGED_USER_IDS_KEY, ()):
+        user_service.invalidate_user(user_id)
+        user_service.note_write(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_users(session: Session, previous_transaction) -> None:
+    session.info.pop(_CHANGED_USER_IDS_KEY, None)
@@ -0,0 +1,73 @@
+"""
+Bloom filter sizing and membership, and the email filter built on it.
+
+Usage:
+    just test
+"""
+
+import math
+import unittest
+
+from core.bloom import BloomFilter
+from services.email_filter import EmailFilter
+
+
+class BloomFilterTest(unittest.TestCase):
+    def test_sized_for_capacity_and_error_rate(self) -> None:
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+
+        # m = -n ln p / (ln 2)^2 and k = m / n ln 2
+        self.assertEqual(bloom.num_bits, 95_851)
+        self.assertEqual(bloom.num_hashes, 7)
+        self.assertEqual(bloom.size_bytes, math.ceil(bloom.num_bits / 8))
+
+    def test_tiny_capacity_still_gets_a_usable_filter(self) -> None:
+        bloom = BloomFilter(capacity=0, error_rate=0.5)
+
+        self.assertGreaterEqual(bloom.num_bits, 8)
+        self.assertGreaterEqual(bloom.num_hashes, 1)
+
+    def test_added_items_are_always_members(self) -> None:
+        bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+        items = [f"user-{i}@example.com" for i in range(1_000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertEqual(bloom.count, 1_000)
+
+    def test_false_positive_rate_stays_near_target_at_capacity(self) -> None:
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"member-{i}")
+
+        false_positives = sum(f"stranger-{i}" in bloom for i in range(20_000))
+
+        self.assertLess(false_positives / 20_000, 0.02)
+
+
+class EmailFilterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.email_filter = EmailFilter(
+            error_rate=0.001,
+            sync_interval=1.0,
+            rebuild_interval=3600.0,
+            sync_overlap=60.0,
+        )
+
+    def test_every_email_might_exist_until_built(self) -> None:
+        self.assertFalse(self.email_filter.ready)
+        self.assertTrue(self.email_filter.might_exist("anyone@example.com"))
+        self.assertEqual(self.email_filter.skipped_lookups, 0)
+
+    def test_registered_emails_match_in_any_case(self) -> None:
+        self.email_filter._filter = BloomFilter(capacity=100, error_rate=0.001)
+        self.email_filter.add("Ada@Example.com")
+
+        self.assertTrue(self.email_filter.might_exist(" ada@example.COM "))
+        self.assertFalse(self.email_filter.might_exist("bob@example.com"))
+        self.assertEqual(self.email_filter.skipped_lookups, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Email filter sync against a live database.
+
+Needs a migrated PostgreSQL at DATABASE_URL; skipped when none is reachable.
+
+Usage:
+    just test
+"""
+
+import unittest
+import uuid
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from db import db_session_manager
+from db.models import User
+from services.email_filter import EmailFilter
+
+
+def _user_row(email: str) -> dict:
+    name = email.partition("@")[0]
+    return {
+        "first_name": "Filter",
+        "last_name": "Test",
+        "username": name,
+        "email": email,
+        "hashed_password": "not-a-hash",
+    }
+
+
+class EmailFilterSyncTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        try:
+            async with db_session_manager.engine.connect() as conn:
+                await conn.execute(select(1))
+        except (SQLAlchemyError, OSError) as e:
+            self.skipTest(f"PostgreSQL is not available: {str(e)}")
+
+        prefix = f"filter-{uuid.uuid4().hex[:12]}"
+        self.slow_email = f"{prefix}-slow@example.com"
+        self.fast_email = f"{prefix}-fast@example.com"
+        self.email_filter = EmailFilter(
+            error_rate=0.001,
+            sync_interval=1.0,
+            rebuild_interval=3600.0,
+            sync_overlap=60.0,
+        )
+        async with db_session_manager.sessionmaker() as session:
+            await self.email_filter.rebuild(session)
+
+    async def asyncTearDown(self) -> None:
+        async with db_session_manager.engine.begin() as conn:
+            await conn.execute(
+                delete(User).where(User.email.in_([self.slow_email, self.fast_email]))
+            )
+        await db_session_manager.close()
+
+    async def sync(self) -> None:
+        async with db_session_manager.sessionmaker() as session:
+            await self.email_filter.sync(session)
+
+    async def test_sync_picks_up_rows_committed_out_of_order(self) -> None:
+        async with db_session_manager.engine.connect() as slow:
+            # The slow transaction takes the lower id and the earlier
+            # created_at, but commits after the fast one has been synced
+            await slow.execute(insert(User).values(_user_row(self.slow_email)))
+
+            async with db_session_manager.engine.begin() as fast:
+                await fast.execute(insert(User).values(_user_row(self.fast_email)))
+
+            await self.sync()
+            self.assertTrue(self.email_filter.might_exist(self.fast_email))
+
+            await slow.commit()
+
+        await self.sync()
+        self.assertTrue(self.email_filter.might_exist(self.slow_email))
+        self.assertTrue(self.email_filter.might_exist(self.fast_email))
+
+    async def test_unregistered_email_is_skipped(self) -> None:
+        await self.sync()
+        self.assertFalse(self.email_filter.might_exist(self.slow_email))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Line numbers reported by the bulk user import.
+
+Usage:
+    just test
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from commands.import_users import read_rows
+from core.hashing import password_hasher
+from services.user_import_service import (
+    ImportIssue,
+    ImportReport,
+    RejectedRow,
+    UserImportService,
+)
+
+HASHED_PASSWORD = "$2b$12$" + "a" * 53
+
+
+def _csv_row(name: str) -> str:
+    return f"{name},User,{name},{name}@example.com,{HASHED_PASSWORD}\n"
+
+
+def _json_row(name: str) -> str:
+    return (
+        f'{{"first_name": "{name}", "last_name": "User", "username": "{name}", '
+        f'"email": "{name}@example.com", "hashed_password": "{HASHED_PASSWORD}"}}\n'
+    )
+
+
+class ReadRowsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def write(self, name: str, content: str) -> Path:
+        path = self.dir / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_csv_rows_carry_file_line_numbers(self) -> None:
+        path = self.write(
+            "users.csv",
+            "first_name,last_name,username,email,hashed_password\n"
+            + _csv_row("ada")
+            + "\n"
+            + _csv_row("bob"),
+        )
+
+        lines = [line for line, _ in read_rows(path, "csv")]
+
+        # The header is line 1 and line 3 is blank
+        self.assertEqual(lines, [2, 4])
+
+    def test_ndjson_rows_carry_file_line_numbers(self) -> None:
+        path = self.write(
+            "users.ndjson",
+            _json_row("ada") + "\n" + "{not json\n" + '["a list"]\n' + _json_row("bob"),
+        )
+
+        rows = list(read_rows(path, "ndjson"))
+
+        self.assertEqual([line for line, _ in rows], [1, 3, 4, 5])
+        self.assertIsInstance(rows[1][1], RejectedRow)
+        self.assertEqual(rows[2][1], ["a list"])
+
+
+class PrepareBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_issues_report_file_line_numbers(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / "users.ndjson"
+        path.write_text(
+            _json_row("ada")
+            + "\n\n"
+            + "{not json\n"
+            + '"a string"\n'
+            + '{"email": "incomplete@example.com"}\n'
+            + _json_row("bob"),
+            encoding="utf-8",
+        )
+        issues: list[ImportIssue] = []
+        report = ImportReport()
+
+        records = await UserImportService(password_hasher)._prepare_batch(
+            tuple(read_rows(path, "ndjson")), report, issues.append
+        )
+
+        self.assertEqual([record[0] for record in records], [1, 7])
+        self.assertEqual([issue.line for issue in issues], [4, 5, 6])
+        self.assertEqual({issue.kind for issue in issues}, {"rejected"})
+        self.assertEqual(issues[2].email, "incomplete@example.com")
+        self.assertEqual(report.rejected, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
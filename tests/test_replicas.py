@@ -0,0 +1,107 @@
+"""
+Replica rotation: which replicas serve reads, and when they leave rotation.
+
+Usage:
+    just test
+"""
+
+import unittest
+
+from db.replicas import ReplicaSet
+
+
+class _FakeSession:
+    def __init__(self, manager: "_FakeManager"):
+        self._manager = manager
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    async def scalar(self, statement):
+        if isinstance(self._manager.lag, Exception):
+            raise self._manager.lag
+        return self._manager.lag
+
+
+class _FakeManager:
+    """Stands in for a replica's session manager, reporting a fixed lag."""
+
+    def __init__(self, lag: float | None | Exception = 0):
+        self.lag = lag
+
+    def sessionmaker(self) -> _FakeSession:
+        return _FakeSession(self)
+
+
+class ReplicaSetTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.managers = [_FakeManager(), _FakeManager(), _FakeManager()]
+        self.replica_set = ReplicaSet(
+            self.managers,
+            max_lag=2.0,
+            check_interval=1.0,
+            max_recent_writers=100,
+        )
+
+    async def _check_all(self) -> None:
+        for replica in self.replica_set._replicas:
+            await self.replica_set._check(replica)
+
+    def _chosen(self, count: int, user_ids: list[int] | None = None) -> list:
+        chosen = [self.replica_set._choose(user_ids or []) for _ in range(count)]
+        return [replica.name if replica else None for replica in chosen]
+
+    async def test_reads_go_to_the_primary_until_replicas_are_checked(self) -> None:
+        self.assertEqual(self._chosen(2), [None, None])
+
+    async def test_reads_rotate_over_healthy_replicas(self) -> None:
+        await self._check_all()
+
+        self.assertEqual(sorted(self._chosen(3)), ["0", "1", "2"])
+        self.assertEqual(self._chosen(3), self._chosen(3))
+
+    async def test_recent_writers_read_from_the_primary(self) -> None:
+        await self._check_all()
+        self.replica_set.note_write(7)
+
+        self.assertEqual(self._chosen(2, [7]), [None, None])
+        self.assertIsNotNone(self._chosen(1, [8])[0])
+
+    async def test_lagging_replica_leaves_rotation_until_it_catches_up(self) -> None:
+        self.managers[1].lag = 5.0
+        await self._check_all()
+
+        self.assertEqual(set(self._chosen(4)), {"0", "2"})
+
+        self.managers[1].lag = 1.5
+        await self._check_all()
+
+        self.assertEqual(set(self._chosen(3)), {"0", "1", "2"})
+
+    async def test_replica_not_streaming_leaves_rotation(self) -> None:
+        await self._check_all()
+        self.managers[0].lag = None
+        await self._check_all()
+
+        self.assertEqual(set(self._chosen(4)), {"1", "2"})
+
+    async def test_replica_failing_its_check_leaves_rotation(self) -> None:
+        await self._check_all()
+        self.managers[2].lag = OSError("connection refused")
+        await self._check_all()
+
+        self.assertEqual(set(self._chosen(4)), {"0", "1"})
+
+    async def test_no_healthy_replica_reads_from_the_primary(self) -> None:
+        for manager in self.managers:
+            manager.lag = None
+        await self._check_all()
+
+        self.assertEqual(self._chosen(2), [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Key ring reloads and the verified token cache.
+
+Usage:
+    just test
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.cache import TTLCache
+from core.exceptions import InvalidTokenError
+from core.key_ring import KeyRing, load_keys_from_directory
+from services.token_service import TokenService
+
+ALGORITHM = "HS256"
+
+
+class KeyRingReloadTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name)
+        self.write_key("old", "o" * 32)
+        self.write_key("new", "n" * 32)
+        self.activate("old")
+
+        keys, active_kid = load_keys_from_directory(self.path, ALGORITHM)
+        self.key_ring = KeyRing(keys, active_kid)
+        self.cache: TTLCache = TTLCache(max_size=100)
+        self.token_service = TokenService(
+            key_ring=self.key_ring,
+            access_token_expire_minutes=30,
+            refresh_token_expire_days=7,
+            cache=self.cache,
+        )
+
+    def write_key(self, kid: str, secret: str) -> None:
+        (self.path / f"{kid}.secret").write_text(secret)
+
+    def activate(self, kid: str) -> None:
+        (self.path / "active").write_text(kid)
+
+    def reload(self) -> None:
+        # What watch_key_directory does when the directory changes
+        keys, active_kid = load_keys_from_directory(self.path, ALGORITHM)
+        self.key_ring.replace(keys, active_kid)
+
+    def issue(self) -> str:
+        token = self.token_service.create_access_token({"sub": "1"})
+        self.token_service.decode_token(token, expected_type="access")
+        return token
+
+    def test_reload_of_unchanged_files_keeps_cached_tokens(self) -> None:
+        token = self.issue()
+
+        self.reload()
+        self.token_service.decode_token(token, expected_type="access")
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.stats.invalidations, 0)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_promotion_keeps_tokens_of_the_previous_key(self) -> None:
+        token = self.issue()
+
+        self.activate("new")
+        self.reload()
+        self.token_service.decode_token(token, expected_type="access")
+
+        self.assertEqual(self.cache.stats.invalidations, 0)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_retiring_a_key_evicts_only_its_tokens(self) -> None:
+        old_token = self.issue()
+        self.activate("new")
+        self.reload()
+        new_token = self.issue()
+
+        (self.path / "old.secret").unlink()
+        self.reload()
+
+        with self.assertRaises(InvalidTokenError):
+            self.token_service.decode_token(old_token)
+        self.token_service.decode_token(new_token, expected_type="access")
+        self.assertEqual(self.cache.stats.invalidations, 1)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    def test_replacing_a_secret_evicts_its_tokens(self) -> None:
+        token = self.issue()
+
+        self.write_key("old", "r" * 32)
+        self.reload()
+
+        with self.assertRaises(InvalidTokenError):
+            self.token_service.decode_token(token)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tail sampling decisions, including how gRPC aborts count toward them.
+
+Usage:
+    just test
+"""
+
+import time
+import unittest
+from unittest import mock
+
+import grpc
+
+from core.tracing import Span, TailSampler, Tracer
+from interfaces.grpc import interceptors
+
+
+def _root(duration_seconds: float = 0.001, error: str | None = None) -> Span:
+    end_ns = time.time_ns()
+    return Span(
+        name="root",
+        trace_id="1" * 32,
+        span_id="2" * 16,
+        parent_id=None,
+        start_ns=end_ns - int(duration_seconds * 1e9),
+        end_ns=end_ns,
+        error=error,
+    )
+
+
+class TailSamplerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.draw = 0.5
+        self.sampler = TailSampler(
+            sample_rate=0.1,
+            slow_threshold_seconds=1.0,
+            slow_sample_rate=0.6,
+            error_sample_rate=0.9,
+            rand=lambda: self.draw,
+        )
+
+    def test_keeps_traces_the_caller_sampled(self) -> None:
+        self.draw = 0.99
+
+        self.assertTrue(self.sampler.keep(_root(), parent_sampled=True))
+        self.assertTrue(self.sampler.keep(_root(error="boom"), parent_sampled=True))
+
+    def test_ordinary_traces_use_the_base_rate(self) -> None:
+        self.assertFalse(self.sampler.keep(_root(), parent_sampled=False))
+        self.draw = 0.05
+        self.assertTrue(self.sampler.keep(_root(), parent_sampled=False))
+
+    def test_slow_traces_use_the_slow_rate(self) -> None:
+        self.assertTrue(self.sampler.keep(_root(2.0), parent_sampled=False))
+        self.draw = 0.7
+        self.assertFalse(self.sampler.keep(_root(2.0), parent_sampled=False))
+
+    def test_failed_traces_use_the_error_rate(self) -> None:
+        self.draw = 0.7
+        self.assertTrue(self.sampler.keep(_root(error="boom"), parent_sampled=False))
+        self.draw = 0.95
+        self.assertFalse(self.sampler.keep(_root(error="boom"), parent_sampled=False))
+
+
+class _CollectingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+
+class _AbortingContext:
+    def __init__(self):
+        self._code = None
+
+    def code(self):
+        return self._code
+
+    async def abort(self, code: grpc.StatusCode, details: str) -> None:
+        self._code = code
+        raise grpc.aio.AbortError(details)
+
+
+class TracingInterceptorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        # Keep every failed trace and no ordinary one
+        self.exporter = _CollectingExporter()
+        sampler = TailSampler(
+            sample_rate=0.0,
+            slow_threshold_seconds=60.0,
+            slow_sample_rate=0.0,
+            error_sample_rate=1.0,
+        )
+        tracer = Tracer(sampler, self.exporter, max_spans_per_trace=10)
+        patcher = mock.patch.object(interceptors, "tracer", tracer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.details = mock.Mock(invocation_metadata=())
+
+    async def _call(self, code: grpc.StatusCode) -> None:
+        context = _AbortingContext()
+        around = interceptors.TracingInterceptor().around(
+            "ValidateToken", self.details, context
+        )
+        with self.assertRaises(grpc.aio.AbortError):
+            with around:
+                await context.abort(code, "Invalid token")
+
+    async def test_client_error_abort_is_not_an_error(self) -> None:
+        await self._call(grpc.StatusCode.UNAUTHENTICATED)
+
+        self.assertEqual(self.exporter.spans, [])
+
+    async def test_server_error_abort_is_kept_as_an_error(self) -> None:
+        await self._call(grpc.StatusCode.INTERNAL)
+
+        [root] = self.exporter.spans
+        self.assertEqual(root.attributes["rpc.code"], "INTERNAL")
+        self.assertIsNotNone(root.error)
+
+
+if __name__ == "__main__":
+    unittest.main()